@@ -0,0 +1,82 @@
+"""Cold-start regression check for the analysis core.
+
+Imports the core modules in a fresh interpreter, reports wall time and peak
+resident memory, and fails if a heavy optional dependency was pulled in or
+a threshold is exceeded:
+
+    python benchmarks/import_time.py --max-seconds 0.5 --max-rss-mb 60
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+CORE_MODULES = (
+    'bendrix.beam_analysis.beam',
+    'bendrix.beam_analysis.supports',
+    'bendrix.loads.loads',
+    'bendrix.utils.unit_conversion',
+)
+
+# Modules the core must not import on its own
+FORBIDDEN = ('matplotlib', 'scipy')
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+for name in {modules!r}:
+    __import__(name)
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.platform == 'darwin':
+    rss //= 1024
+loaded = sorted({{m.split('.')[0] for m in sys.modules}} & set({forbidden!r}))
+print(json.dumps({{'seconds': elapsed, 'max_rss_kb': rss, 'forbidden': loaded}}))
+"""
+
+
+def measure(modules=CORE_MODULES, repeat=5):
+    """Import modules in `repeat` fresh interpreters; return the fastest run."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')])))
+    code = _PROBE.format(modules=tuple(modules), forbidden=FORBIDDEN)
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                             capture_output=True, text=True).stdout
+        runs.append(json.loads(out))
+    best = min(runs, key=lambda r: r['seconds'])
+    best['max_rss_kb'] = min(r['max_rss_kb'] for r in runs)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters to start')
+    parser.add_argument('--max-seconds', type=float, default=None, help='fail above this import time')
+    parser.add_argument('--max-rss-mb', type=float, default=None, help='fail above this peak RSS')
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    args = parser.parse_args(argv)
+
+    result = measure(repeat=args.repeat)
+    rss_mb = result['max_rss_kb'] / 1024
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"import time {result['seconds'] * 1000:.1f} ms, peak RSS {rss_mb:.1f} MB")
+
+    errors = []
+    if result['forbidden']:
+        errors.append(f"core import loaded {', '.join(result['forbidden'])}")
+    if args.max_seconds is not None and result['seconds'] > args.max_seconds:
+        errors.append(f"import time {result['seconds']:.3f} s exceeds {args.max_seconds} s")
+    if args.max_rss_mb is not None and rss_mb > args.max_rss_mb:
+        errors.append(f"peak RSS {rss_mb:.1f} MB exceeds {args.max_rss_mb} MB")
+    for error in errors:
+        print(f"FAIL: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
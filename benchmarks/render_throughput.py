@@ -0,0 +1,62 @@
+"""Diagrams per second: Beam.plot_diagrams versus the headless renderer.
+
+The renderer is timed in one process and across --workers processes
+(default: every CPU), so the two speedups can be read separately:
+
+    python benchmarks/render_throughput.py --beams 200 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bendrix.beam_analysis.beam import Beam
+from bendrix.beam_analysis.supports import Support
+from bendrix.loads.loads import PointLoad, UniformDistributedLoad
+from bendrix.plotting.renderer import render_diagrams
+
+
+def sample_beam(i):
+    length = 1000.0 + 10 * i
+    beam = Beam(length, 'simply_supported')
+    beam.add_support(Support(0, 'pinned'))
+    beam.add_support(Support(length, 'roller'))
+    beam.add_load(PointLoad(10 + i, length / 3))
+    beam.add_load(UniformDistributedLoad(2, 0, length / 2))
+    return beam
+
+
+def throughput(beams, out, workers):
+    start = time.perf_counter()
+    render_diagrams(beams, out, workers=workers)
+    return len(beams) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--beams', type=int, default=100)
+    parser.add_argument('--baseline', type=int, default=20, help='beams drawn with plot_diagrams')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    beams = [sample_beam(i) for i in range(args.beams)]
+    with tempfile.TemporaryDirectory() as out:
+        start = time.perf_counter()
+        for i, beam in enumerate(beams[:args.baseline]):
+            beam.plot_diagrams(save_path=os.path.join(out, f"old_{i}.png"), show=False)
+        old = min(args.baseline, len(beams)) / (time.perf_counter() - start)
+
+        single = throughput(beams, os.path.join(out, 'single'), 1)
+        workers = args.workers or os.cpu_count() or 1
+        multi = throughput(beams, os.path.join(out, 'multi'), workers) if workers > 1 else None
+    print(f"plot_diagrams {old:.1f}/s")
+    print(f"renderer, 1 process {single:.1f}/s ({single / old:.1f}x)")
+    if multi is not None:
+        print(f"renderer, {workers} processes {multi:.1f}/s ({multi / old:.1f}x, {multi / single:.1f}x over 1 process)")
+
+
+if __name__ == '__main__':
+    main()
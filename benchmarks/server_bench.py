@@ -0,0 +1,156 @@
+"""Latency and throughput of a local `bendrix serve` instance.
+
+Starts a server on a temporary Unix socket (or uses --socket/--port of a
+running one), then measures:
+
+  * a fresh `python -m bendrix run` process per model, for reference
+  * sequential request latency (p50/p95/p99) from one client
+  * throughput with several concurrent clients pipelining requests
+
+    python benchmarks/server_bench.py --workers 4 --clients 1 4 16
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from bendrix.client import Client
+
+
+def make_models(count, seed=0):
+    """Continuous three-span beams with the same load structure, random values."""
+    rng = np.random.default_rng(seed)
+    models = []
+    for i in range(count):
+        length = float(rng.uniform(6000, 12000))
+        models.append({
+            'name': f"beam_{i}", 'length': length, 'beam_type': 'continuous',
+            'supports': [{'position': p, 'type': t} for p, t in
+                         ((0.0, 'pinned'), (length / 3, 'roller'), (2 * length / 3, 'roller'), (length, 'roller'))],
+            'loads': [{'kind': 'point', 'magnitude': float(m), 'position': float(p)}
+                      for m, p in zip(rng.uniform(1, 20, 5), rng.uniform(0, length, 5))]
+                     + [{'kind': 'udl', 'magnitude': float(rng.uniform(0.5, 2)), 'start': 0.0, 'end': length}],
+        })
+    return models
+
+
+def start_server(path, workers, max_delay):
+    cmd = [sys.executable, '-m', 'bendrix', 'serve', '--socket', path, '--max-delay', str(max_delay)]
+    if workers is not None:
+        cmd += ['--workers', str(workers)]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if not line:
+        raise RuntimeError("Server did not start")
+    print(line.strip(), file=sys.stderr)
+    return proc
+
+
+def cold_process(model, repeat):
+    """Seconds for a new interpreter to analyze one model with `bendrix run`."""
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.json')
+        with open(path, 'w') as f:
+            json.dump(model, f)
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-m', 'bendrix', 'run', path, '-o', tmp, '-w', '1'],
+                           cwd=ROOT, check=True, capture_output=True)
+            times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def latency(connect, models, points):
+    times = []
+    with connect() as client:
+        for model in models:
+            start = time.perf_counter()
+            client.analyze(model, points)
+            times.append(time.perf_counter() - start)
+    q = statistics.quantiles(times, n=100)
+    return {'p50_ms': q[49] * 1e3, 'p95_ms': q[94] * 1e3, 'p99_ms': q[98] * 1e3}
+
+
+def throughput(connect, models, points, clients):
+    errors = []
+
+    def work():
+        with connect() as client:
+            errors.extend(r for r in client.analyze_many(models, points) if 'error' in r)
+    threads = [threading.Thread(target=work) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise RuntimeError(errors[0]['error'])
+    return {'clients': clients, 'requests': clients * len(models), 'seconds': elapsed,
+            'requests_per_s': clients * len(models) / elapsed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--socket', help='use a running server on this Unix socket')
+    parser.add_argument('--port', type=int, help='use a running server on this TCP port')
+    parser.add_argument('--workers', type=int, default=None, help='workers of the started server')
+    parser.add_argument('--max-delay', type=float, default=0.0, help='batch delay (ms) of the started server')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=500, help='requests per client')
+    parser.add_argument('--points', type=int, default=200)
+    parser.add_argument('--cold', type=int, default=3, help='cold-process runs (0 to skip)')
+    parser.add_argument('--json', help='also write the results here')
+    args = parser.parse_args(argv)
+
+    models = make_models(args.requests)
+    proc = tmp = None
+    if args.port:
+        connect = lambda: Client(port=args.port)
+    else:
+        path = args.socket
+        if not path:
+            tmp = tempfile.mkdtemp(prefix='bendrix-bench-')
+            path = os.path.join(tmp, 'bendrix.sock')
+            proc = start_server(path, args.workers, args.max_delay)
+        connect = lambda: Client(path=path)
+    results = {}
+    try:
+        if args.cold:
+            results['cold_process_s'] = cold_process(models[0], args.cold)
+            print(f"cold process per model     {results['cold_process_s'] * 1e3:10.1f} ms")
+        results['latency'] = latency(connect, models[:min(len(models), 300)], args.points)
+        print("sequential latency         " + "  ".join(f"{k} {v:.2f}" for k, v in results['latency'].items()))
+        results['throughput'] = []
+        for clients in args.clients:
+            row = throughput(connect, models, args.points, clients)
+            results['throughput'].append(row)
+            print(f"{clients:3d} client(s)               {row['requests_per_s']:10.0f} requests/s")
+        with connect() as client:
+            results['server_stats'] = client.stats()
+        stats = results['server_stats']
+        print(f"server: {stats['requests']} requests in {stats['batches']} batches "
+              f"(mean {stats['requests'] / max(stats['batches'], 1):.1f}, max {stats['max_batch']})")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+            os.rmdir(tmp)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""Benchmark suite for the analysis hot paths.
+
+Run the suite and save machine-readable results, then compare two runs:
+
+    python benchmarks/suite.py run -o base.json
+    python benchmarks/suite.py run -o new.json --quick --filter reactions
+    python benchmarks/suite.py compare base.json new.json --threshold 0.15
+
+Each benchmark reports the best and median wall time per call over several
+repeats; compare flags benchmarks whose best time grew by more than the
+threshold and exits non-zero if any did.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from bendrix.beam_analysis.beam import Beam
+from bendrix.beam_analysis.supports import Support
+from bendrix.beam_analysis.batch import BeamBatch
+from bendrix.beam_analysis.reliability import MonteCarlo, Normal, Uniform
+from bendrix.loads.loads import PointLoad, UniformDistributedLoad, LoadSet
+from import_time import measure as measure_import
+
+BEAM_TYPES = ('simply_supported', 'cantilever', 'overhanging', 'fixed', 'continuous', 'propped_cantilever')
+LENGTH = 6000.0
+
+SWEEPS = {
+    'full': {'loads': (1, 10, 100, 1000), 'points': (100, 1000, 10000, 100000), 'beams': (10, 100, 1000),
+             'samples': (1000, 100000)},
+    'quick': {'loads': (1, 100), 'points': (100, 10000), 'beams': (10, 100), 'samples': (1000, 10000)},
+}
+
+SUPPORTS = {
+    'simply_supported': ((0, 'pinned'), (LENGTH, 'roller')),
+    'cantilever': ((0, 'fixed'),),
+    'overhanging': ((1000, 'pinned'), (5000, 'roller')),
+    'fixed': ((0, 'fixed'), (LENGTH, 'fixed')),
+    'continuous': ((0, 'pinned'), (2500, 'roller'), (LENGTH, 'roller')),
+    'propped_cantilever': ((0, 'fixed'), (LENGTH, 'roller')),
+}
+
+
+def make_beam(beam_type, num_loads, seed=0):
+    """Beam of the given type with num_loads point loads plus one UDL."""
+    rng = np.random.default_rng(seed)
+    beam = Beam(LENGTH, beam_type)
+    for position, kind in SUPPORTS[beam_type]:
+        beam.add_support(Support(position, kind))
+    for magnitude, position in zip(rng.uniform(1, 10, num_loads), rng.uniform(0, LENGTH, num_loads)):
+        beam.add_load(PointLoad(float(magnitude), float(position)))
+    beam.add_load(UniformDistributedLoad(1.5, 500, 4500))
+    return beam
+
+
+def timed(func, setup=None, repeat=5, min_time=0.05):
+    """Best and median seconds per call of func(state), state = setup() per repeat."""
+    samples = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        calls, elapsed = 0, 0.0
+        gc.disable()
+        try:
+            while elapsed < min_time or calls == 0:
+                start = time.perf_counter()
+                func(state)
+                elapsed += time.perf_counter() - start
+                calls += 1
+                if setup is not None:
+                    # Each call needs a fresh state (e.g. an empty cache)
+                    break
+        finally:
+            gc.enable()
+        samples.append(elapsed / calls)
+    return {'best': min(samples), 'median': statistics.median(samples), 'repeat': repeat}
+
+
+def bench_reactions(sweep):
+    for beam_type in BEAM_TYPES:
+        for n in sweep['loads']:
+            yield (f"reactions[{beam_type},loads={n}]", {'beam_type': beam_type, 'loads': n},
+                   lambda: timed(lambda b: b.calculate_reactions(), lambda: make_beam(beam_type, n), repeat=10))
+
+
+def bench_loadset(sweep):
+    for n in sweep['loads']:
+        rng = np.random.default_rng(0)
+        magnitudes, positions = rng.uniform(1, 10, n), rng.uniform(0, LENGTH, n)
+
+        def setup():
+            beam = Beam(LENGTH, 'continuous')
+            for position, kind in SUPPORTS['continuous']:
+                beam.add_support(Support(position, kind))
+            beam.add_load(LoadSet().add_point_loads(magnitudes, positions))
+            return beam
+        yield (f"reactions_loadset[continuous,loads={n}]", {'beam_type': 'continuous', 'loads': n},
+               lambda: timed(lambda b: b.calculate_reactions(), setup, repeat=10))
+
+
+def bench_sampling(sweep):
+    for beam_type in BEAM_TYPES:
+        beam = make_beam(beam_type, 20)
+        beam.calculate_reactions()
+        for points in sweep['points']:
+            x = np.linspace(0, LENGTH, points)
+            params = {'beam_type': beam_type, 'points': points}
+            yield f"shear_at[{beam_type},points={points}]", params, lambda: timed(lambda _: beam._compute_shear_at(x))
+            yield f"evaluate[{beam_type},points={points}]", params, lambda: timed(lambda _: beam.evaluate(x))
+
+
+def bench_export(sweep, out_dir):
+    beam = make_beam('continuous', 20)
+    beam.calculate_reactions()
+    for points in sweep['points']:
+        for ext in ('csv', 'npy'):
+            path = os.path.join(out_dir, f"export.{ext}")
+            yield (f"export_{ext}[points={points}]", {'points': points},
+                   lambda: timed(lambda _: beam.export_sf_bm(path, points), repeat=3))
+
+
+def bench_plot(sweep, out_dir):
+    beam = make_beam('simply_supported', 20)
+    path = os.path.join(out_dir, 'plot.png')
+    yield "plot_diagrams", {}, lambda: timed(lambda _: beam.plot_diagrams(save_path=path, show=False),
+                                             repeat=3, min_time=0)
+
+    def renderer_png():
+        from bendrix.plotting.renderer import DiagramRenderer
+        renderer = DiagramRenderer()
+        return timed(lambda _: renderer.save(beam, path), repeat=3, min_time=0)
+    yield "renderer_png", {}, renderer_png
+
+
+def bench_beams(sweep):
+    for n in sweep['beams']:
+        lengths = np.linspace(4000, 8000, n)
+
+        def loop(_):
+            for length in lengths:
+                beam = Beam(length, 'simply_supported')
+                beam.add_support(Support(0, 'pinned'))
+                beam.add_support(Support(length, 'roller'))
+                beam.add_load(PointLoad(10, length / 3))
+                beam.calculate_reactions()
+                beam.get_samples(101)
+
+        def batch(_):
+            b = BeamBatch(lengths)
+            b.add_support(0, 'pinned')
+            b.add_support(lengths, 'roller')
+            b.add_point_loads(10, lengths / 3)
+            b.calculate_reactions()
+            b.evaluate(101)
+        yield f"beams_loop[beams={n}]", {'beams': n}, lambda: timed(loop, repeat=3, min_time=0)
+        yield f"beams_batch[beams={n}]", {'beams': n}, lambda: timed(batch, repeat=3, min_time=0)
+
+
+def bench_edits(sweep):
+    # Incremental updates of a beam whose results are already cached
+    for n in sweep['loads']:
+        beam = make_beam('continuous', n)
+        load = beam.loads[0]
+        positions = iter(np.tile([1000.0, 4000.0], 10 ** 6))
+
+        def prepared():
+            beam.calculate_reactions()
+            beam.get_samples(200)
+
+        def update(_):
+            beam.update_load(load, position=next(positions))
+
+        def remove_add(_):
+            beam.remove_load(load)
+            beam.add_load(load)
+        params = {'beam_type': 'continuous', 'loads': n}
+        yield f"update_load[continuous,loads={n}]", params, lambda: (prepared(), timed(update))[1]
+        yield f"remove_add_load[continuous,loads={n}]", params, lambda: (prepared(), timed(remove_add))[1]
+
+
+def bench_reliability(sweep):
+    beam = make_beam('continuous', 2)
+    point, udl = beam.loads[0], beam.loads[-1]
+    mc = MonteCarlo(beam).vary(point, magnitude=Normal(5, 1), position=Uniform(0, LENGTH))
+    mc.vary(udl, magnitude=Normal(1.5, 0.2))
+    for n in sweep['samples']:
+        yield (f"monte_carlo[samples={n}]", {'samples': n},
+               lambda: timed(lambda _: mc.run(n, seed=0), repeat=3, min_time=0))
+
+
+def bench_memory(sweep):
+    def peak(n):
+        gc.collect()
+        tracemalloc.start()
+        beam = make_beam('continuous', n)
+        beam.calculate_reactions()
+        beam.get_samples(max(sweep['points']))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return {'bytes': peak}
+    for n in sweep['loads']:
+        yield f"peak_memory[continuous,loads={n}]", {'loads': n}, lambda: peak(n)
+
+
+def bench_import():
+    def cold_import():
+        result = measure_import()
+        return {'best': result['seconds'], 'max_rss_kb': result['max_rss_kb'], 'forbidden': result['forbidden']}
+    yield "cold_import", {}, cold_import
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'machine': platform.machine(), 'commit': commit, 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def run_suite(quick=False, name_filter=None, plots=True):
+    sweep = SWEEPS['quick' if quick else 'full']
+    results = {}
+    with tempfile.TemporaryDirectory() as out_dir:
+        groups = [bench_import(), bench_reactions(sweep), bench_loadset(sweep), bench_sampling(sweep),
+                  bench_export(sweep, out_dir), bench_beams(sweep), bench_edits(sweep), bench_reliability(sweep),
+                  bench_memory(sweep)]
+        if plots:
+            groups.append(bench_plot(sweep, out_dir))
+        for group in groups:
+            # Groups yield (name, params, measure); measure runs only for
+            # benchmarks that pass the filter, before the group resumes
+            for name, params, measure in group:
+                if name_filter and name_filter not in name:
+                    continue
+                stats = measure()
+                results[name] = dict(stats, params=params)
+                value = stats.get('best', stats.get('bytes'))
+                unit = 's' if 'best' in stats else 'B'
+                print(f"{name:50s} {value:12.6g} {unit}", file=sys.stderr)
+    return {'meta': metadata(), 'results': results}
+
+
+def compare(base, new, threshold=0.1):
+    """Return rows (name, base, new, ratio, regressed) for benchmarks in both runs."""
+    rows = []
+    for name in sorted(set(base['results']) & set(new['results'])):
+        old, cur = base['results'][name], new['results'][name]
+        key = 'best' if 'best' in old else 'bytes'
+        if key not in cur or not old[key]:
+            continue
+        ratio = cur[key] / old[key]
+        rows.append((name, old[key], cur[key], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='run the benchmarks')
+    run.add_argument('-o', '--output', help='write JSON results here (default: stdout)')
+    run.add_argument('--quick', action='store_true', help='smaller sweeps')
+    run.add_argument('--filter', help='only benchmarks whose name contains this text')
+    run.add_argument('--no-plots', action='store_true', help='skip matplotlib benchmarks')
+    cmp = commands.add_parser('compare', help='compare two result files')
+    cmp.add_argument('base')
+    cmp.add_argument('new')
+    cmp.add_argument('--threshold', type=float, default=0.1, help='allowed slowdown (0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        data = run_suite(args.quick, args.filter, not args.no_plots)
+        text = json.dumps(data, indent=2)
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text)
+        else:
+            print(text)
+        return 0
+
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    rows = compare(base, new, args.threshold)
+    for name, old, cur, ratio, regressed in rows:
+        flag = 'REGRESSION' if regressed else ''
+        print(f"{name:50s} {old:12.6g} {cur:12.6g} {ratio:7.2f}x {flag}")
+    regressions = [r for r in rows if r[4]]
+    print(f"{len(regressions)} regression(s) in {len(rows)} benchmarks (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,6 @@
+# Allows running the command-line interface with python -m bendrix
+import sys
+from .cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,337 @@
+import numpy as np
+from .stiffness import element_stiffness, hermite_shape, hermite_slope, GAUSS_POINTS, GAUSS_WEIGHTS
+from .diagrams import singularity_terms
+from ..utils.unit_conversion import UnitConversion
+
+
+def singularity_powers(x, a, highest, length):
+    """Return [<x - a>**n / n! for n in 0..highest].
+
+    Right-continuous like Beam.evaluate, except at the beam end where the
+    left limit is taken. Each power is built from the previous one, which is
+    much cheaper than calling ** on large arrays.
+    """
+    d = x - a
+    on = np.where(x >= length, d > 0, d >= 0)
+    powers = [on.astype(float)]
+    if highest >= 1:
+        powers.append(np.where(on, d, 0.0))
+    for n in range(2, highest + 1):
+        powers.append(powers[-1] * powers[1] / n)
+    return powers
+
+
+class BeamBatch:
+    """Many beams with the same support layout, stored as NumPy columns.
+
+    Every beam has its own length, support positions and load values; row n
+    of each array belongs to beam n. Supports are added per column (one call
+    adds that support to every beam) and loads are stored as singularity
+    terms, so reactions and SF/BM for all N beams come out of a few
+    broadcast operations instead of N Beam objects.
+    """
+
+    def __init__(self, lengths, length_unit='mm'):
+        self.lengths = UnitConversion.convert(np.atleast_1d(np.asarray(lengths, dtype=float)), length_unit, 'mm')
+        self.size = len(self.lengths)
+        self.support_positions = np.zeros((self.size, 0))
+        self.support_types = []
+        self._coef = []
+        self._pos = []
+        self._order = []
+        self.flexural_rigidity = None
+
+    def set_flexural_rigidity(self, ei, ei_unit='N*mm2'):
+        """Set a constant EI per beam, scalar or (N,), for deflections()."""
+        ei = UnitConversion.convert(np.asarray(ei, dtype=float), ei_unit, 'N*mm2')
+        self.flexural_rigidity = np.broadcast_to(ei, (self.size,)).copy()
+
+    def _column(self, values, unit, target):
+        # Scalars and (N,) arrays become one column; (N, k) arrays stay k columns
+        values = UnitConversion.convert(np.asarray(values, dtype=float), unit, target)
+        if values.ndim < 2:
+            values = np.broadcast_to(values, (self.size,))[:, None]
+        return np.broadcast_to(values, (self.size, values.shape[1]))
+
+    def _add_terms(self, coef, pos, order):
+        for k in range(coef.shape[1]):
+            self._coef.append(coef[:, k])
+            self._pos.append(pos[:, k])
+            self._order.append(order)
+
+    def add_support(self, positions, type='pinned', position_unit='mm'):
+        positions = self._column(positions, position_unit, 'mm')[:, 0]
+        if np.any(positions < 0) or np.any(positions > self.lengths):
+            raise ValueError("Support position must be within beam length")
+        self.support_positions = np.column_stack((self.support_positions, positions))
+        self.support_types.append(type)
+
+    def add_point_loads(self, magnitudes, positions, magnitude_unit='N', position_unit='mm'):
+        """Add point loads; arrays of shape (N,) or (N, k) add k loads per beam."""
+        magnitude = self._column(magnitudes, magnitude_unit, 'N')
+        position = self._column(positions, position_unit, 'mm')
+        magnitude, position = np.broadcast_arrays(magnitude, position)
+        self._add_terms(-magnitude, position, 0)
+
+    def add_udls(self, magnitudes, starts, ends, magnitude_unit='N/mm', start_unit='mm', end_unit='mm'):
+        w = self._column(magnitudes, magnitude_unit, 'N/mm')
+        a = self._column(starts, start_unit, 'mm')
+        b = self._column(ends, end_unit, 'mm')
+        w, a, b = np.broadcast_arrays(w, a, b)
+        self._add_terms(-w, a, 1)
+        self._add_terms(w, b, 1)
+
+    def add_uvls(self, start_magnitudes, end_magnitudes, starts, ends, mag_unit='N/mm', start_unit='mm', end_unit='mm'):
+        q0 = self._column(start_magnitudes, mag_unit, 'N/mm')
+        q1 = self._column(end_magnitudes, mag_unit, 'N/mm')
+        a = self._column(starts, start_unit, 'mm')
+        b = self._column(ends, end_unit, 'mm')
+        q0, q1, a, b = np.broadcast_arrays(q0, q1, a, b)
+        slope = (q1 - q0) / (b - a)
+        self._add_terms(-q0, a, 1)
+        self._add_terms(-slope, a, 2)
+        self._add_terms(q1, b, 1)
+        self._add_terms(slope, b, 2)
+
+    def add_moment_loads(self, magnitudes, positions, magnitude_unit='N*mm', position_unit='mm'):
+        magnitude = self._column(magnitudes, magnitude_unit, 'N*mm')
+        position = self._column(positions, position_unit, 'mm')
+        magnitude, position = np.broadcast_arrays(magnitude, position)
+        self._add_terms(magnitude, position, -1)
+
+    @classmethod
+    def from_beams(cls, beams):
+        """Stack Beam objects that share support layout and load structure.
+
+        The batch solve assumes a constant EI along each beam, so beams with
+        a stepped flexural rigidity are rejected.
+        """
+        if not beams:
+            raise ValueError("Need at least one beam")
+        batch = cls([b.length for b in beams])
+        layout = [s.type for s in beams[0].supports]
+        terms = []
+        for b in beams:
+            if [s.type for s in b.supports] != layout:
+                raise ValueError("All beams in a batch must share the same support layout")
+            if b.flexural_rigidity is not None and len(np.unique(b.flexural_rigidity[1])) > 1:
+                raise ValueError("Beams with a stepped flexural rigidity cannot be batched")
+            terms.append(singularity_terms(b.loads))
+        orders = terms[0][2]
+        if any(len(t[2]) != len(orders) or np.any(t[2] != orders) for t in terms):
+            raise ValueError("All beams in a batch must have the same kinds of loads")
+        for i in range(len(layout)):
+            batch.add_support([b.supports[i].position for b in beams], layout[i])
+        coef = np.array([t[0] for t in terms]).reshape(len(beams), -1)
+        pos = np.array([t[1] for t in terms]).reshape(len(beams), -1)
+        batch.add_terms(coef, pos, orders)
+        if all(b.flexural_rigidity is not None for b in beams):
+            batch.set_flexural_rigidity([b.flexural_rigidity[1][0] for b in beams])
+        return batch
+
+    def add_terms(self, coefficients, positions, orders):
+        """Add raw singularity terms (Load.get_singularity_terms convention).
+
+        coefficients and positions are (T,) for terms shared by every beam
+        or (N, T); orders is (T,).
+        """
+        orders = np.atleast_1d(np.asarray(orders, dtype=int))
+        coef = np.broadcast_to(np.asarray(coefficients, dtype=float), (self.size, len(orders)))
+        pos = np.broadcast_to(np.asarray(positions, dtype=float), (self.size, len(orders)))
+        for k, order in enumerate(orders):
+            self._add_terms(coef[:, k:k + 1], pos[:, k:k + 1], int(order))
+
+    def get_terms(self):
+        """Return (coefficients, positions) of shape (N, T) and orders (T,)."""
+        if not self._coef:
+            return np.zeros((self.size, 0)), np.zeros((self.size, 0)), np.zeros(0, dtype=int)
+        return np.column_stack(self._coef), np.column_stack(self._pos), np.array(self._order)
+
+    def _nodes(self):
+        # Nodes are the beam ends plus every support; ends that coincide with a
+        # support must do so for every beam so all systems have the same size.
+        pos = self.support_positions
+        order = np.argsort(pos, axis=1, kind='stable')
+        if np.any(order != order[0]):
+            raise ValueError("Supports must be in the same order along every beam")
+        at_start = pos == 0
+        at_end = pos == self.lengths[:, None]
+        if np.any(at_start != at_start[0]) or np.any(at_end != at_end[0]):
+            raise ValueError("Supports must share the same layout across the batch")
+        columns = [pos[:, order[0]]]
+        if not np.any(at_start[0]):
+            columns.insert(0, np.zeros((self.size, 1)))
+        if not np.any(at_end[0]):
+            columns.append(self.lengths[:, None])
+        nodes = np.column_stack(columns)
+        if np.any(np.diff(nodes, axis=1) <= 0):
+            raise ValueError("Supports must be at distinct positions")
+        support_node = np.empty(len(self.support_types), dtype=int)
+        support_node[order[0]] = np.arange(len(self.support_types)) + (0 if np.any(at_start[0]) else 1)
+        return nodes, support_node
+
+    def _nodal_loads(self, nodes, coef, pos, orders):
+        n_el = nodes.shape[1] - 1
+        h = np.diff(nodes, axis=1)
+        rows = np.arange(self.size)
+        load = np.zeros((self.size, 2 * nodes.shape[1]))
+        for k, order in enumerate(orders):
+            c, a = coef[:, k], pos[:, k]
+            if order <= 0:
+                e = np.clip(np.sum(nodes[:, 1:-1] <= a[:, None], axis=1), 0, n_el - 1)
+                he = h[rows, e]
+                xi = (a - nodes[rows, e]) / he
+                if order == 0:
+                    contribution = c[:, None] * hermite_shape(xi, he)
+                else:
+                    # Clockwise couples against counterclockwise rotations
+                    contribution = -c[:, None] * hermite_slope(xi, he)
+                for j in range(4):
+                    np.add.at(load, (rows, 2 * e + j), contribution[:, j])
+            else:
+                # Step or ramp in intensity from a onwards: integrate over the
+                # loaded part of every element by Gauss quadrature
+                x0 = np.maximum(nodes[:, :-1], a[:, None])
+                span = np.clip(nodes[:, 1:] - x0, 0.0, None)
+                x = x0[..., None] + span[..., None] * GAUSS_POINTS
+                intensity = c[:, None, None] * (x - a[:, None, None]) ** (order - 1)
+                xi = (x - nodes[:, :-1, None]) / h[..., None]
+                shape = hermite_shape(xi, h[..., None])
+                weights = (intensity * GAUSS_WEIGHTS * span[..., None])[..., None]
+                element_load = np.sum(weights * shape, axis=2)
+                for j in range(4):
+                    load[:, j:j + 2 * n_el:2] += element_load[:, :, j]
+        return load
+
+    def calculate_reactions(self):
+        """Return (forces, moments), each (N, supports), for every beam.
+
+        Forces are upward; moments are clockwise couples as in Beam.
+        """
+        nodes, support_node = self._nodes()
+        n_el = nodes.shape[1] - 1
+        ndof = 2 * nodes.shape[1]
+        k = element_stiffness(np.diff(nodes, axis=1), 1.0)
+        stiffness = np.zeros((self.size, ndof, ndof))
+        for e in range(n_el):
+            stiffness[:, 2 * e:2 * e + 4, 2 * e:2 * e + 4] += k[:, e]
+        coef, pos, orders = self.get_terms()
+        load = self._nodal_loads(nodes, coef, pos, orders)
+
+        fixed = np.array([t == 'fixed' for t in self.support_types], dtype=bool)
+        force_dofs = 2 * support_node
+        moment_dofs = 2 * support_node[fixed] + 1
+        restrained = np.concatenate((force_dofs, moment_dofs))
+        constrained = stiffness.copy()
+        constrained[:, restrained, :] = 0.0
+        constrained[:, :, restrained] = 0.0
+        constrained[:, restrained, restrained] = 1.0
+        rhs = load.copy()
+        rhs[:, restrained] = 0.0
+        try:
+            u = np.linalg.solve(constrained, rhs[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            raise ValueError("Supports do not restrain the beams against rigid-body motion")
+        residual = np.einsum('nij,nj->ni', stiffness, u) - load
+        forces = residual[:, force_dofs]
+        moments = np.zeros_like(forces)
+        moments[:, fixed] = -residual[:, moment_dofs]
+        return forces, moments
+
+    def _terms_with_reactions(self, reactions=None):
+        forces, moments = self.calculate_reactions() if reactions is None else reactions
+        coef, pos, orders = self.get_terms()
+        n = forces.shape[1]
+        coef = np.column_stack((coef, forces, moments))
+        pos = np.column_stack((pos, self.support_positions, self.support_positions))
+        orders = np.concatenate((orders, np.zeros(n, dtype=int), -np.ones(n, dtype=int)))
+        return coef, pos, orders
+
+    def _integrals(self, x, terms, levels):
+        """Sum the singularity terms at x, integrated `level` times, for each level.
+
+        Level 0 is shear force, 1 bending moment, 2 EI * slope and
+        3 EI * deflection (before integration constants).
+        """
+        coef, pos, orders = terms
+        length = self.lengths[:, None]
+        out = [np.zeros((self.size, x.shape[1])) for _ in levels]
+        # x given as one row is shared by every beam: terms at the same
+        # position in every beam then need their powers only once, and their
+        # sum is one (N, terms) @ (terms, P) product per level
+        shared = x.shape[0] == 1 and np.all(length == length[0])
+        rows = [[] for _ in levels]
+        columns = [[] for _ in levels]
+        for k, order in enumerate(orders):
+            a = pos[:, k:k + 1]
+            if shared and np.all(a == a[0]):
+                powers = singularity_powers(x, a[:1], order + max(levels), length[:1])
+                for i, level in enumerate(levels):
+                    if order + level >= 0:
+                        rows[i].append(powers[order + level][0])
+                        columns[i].append(coef[:, k])
+                continue
+            powers = singularity_powers(x, a, order + max(levels), length)
+            c = coef[:, k:k + 1]
+            for total, level in zip(out, levels):
+                if order + level >= 0:
+                    total += c * powers[order + level]
+        for total, c, p in zip(out, columns, rows):
+            if c:
+                total += np.column_stack(c) @ np.vstack(p)
+        return out
+
+    def _grid(self, num_points):
+        # Row n equals np.linspace(0, length_n, num_points), the grid Beam samples on
+        return np.linspace(0.0, self.lengths, num_points, axis=1)
+
+    def evaluate(self, num_points=200):
+        """Return positions, shear force and bending moment, each (N, num_points).
+
+        Positions are evenly spaced from 0 to each beam's length.
+        """
+        x = self._grid(num_points)
+        sf, bm = self.evaluate_at(x[:1] if np.all(self.lengths == self.lengths[0]) else x)
+        return x, sf, bm
+
+    def evaluate_at(self, x, reactions=None):
+        """Return shear force and bending moment, each (N, P), at positions x.
+
+        x is (P,) or (1, P) for the same positions on every beam, or (N, P).
+        reactions, the (forces, moments) from calculate_reactions, avoids
+        solving again when they are already known.
+        """
+        x = np.asarray(x, dtype=float)
+        x = x[None, :] if x.ndim == 1 else x
+        return self._integrals(x, self._terms_with_reactions(reactions), (0, 1))
+
+    def deflections(self, num_points=200):
+        """Return positions, slope and deflection (mm, positive up), each (N, num_points).
+
+        The integration constants of every beam come from its supports (zero
+        deflection, plus zero slope at fixed supports), solved for all beams
+        in one batched least-squares step.
+        """
+        if self.flexural_rigidity is None:
+            raise ValueError("Flexural rigidity not set; call set_flexural_rigidity first")
+        terms = self._terms_with_reactions()
+        ei = self.flexural_rigidity[:, None]
+        fixed = np.array([t == 'fixed' for t in self.support_types], dtype=bool)
+        supports = self.support_positions
+        v0 = self._integrals(supports, terms, (3,))[0] / ei
+        theta0 = self._integrals(supports[:, fixed], terms, (2,))[0] / ei
+        # Rows [x, 1] for zero deflection and [1, 0] for zero slope
+        a = np.concatenate((np.stack((supports, np.ones_like(supports)), axis=-1),
+                            np.stack((np.ones_like(theta0), np.zeros_like(theta0)), axis=-1)), axis=1)
+        b = -np.concatenate((v0, theta0), axis=1)
+        normal = np.einsum('nri,nrj->nij', a, a)
+        try:
+            constants = np.linalg.solve(normal, np.einsum('nri,nr->ni', a, b)[..., None])[..., 0]
+        except np.linalg.LinAlgError:
+            raise ValueError("Supports do not fix the deflection constants")
+
+        x = self._grid(num_points)
+        slope, deflection = self._integrals(x, terms, (2, 3))
+        slope = slope / ei + constants[:, :1]
+        deflection = deflection / ei + constants[:, :1] * x + constants[:, 1:]
+        return x, slope, deflection
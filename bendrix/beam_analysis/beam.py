@@ -1,24 +1,32 @@
-import os
+import copy
 import numpy as np
-try:
-    # Older SciPy versions expose cumtrapz
-    from scipy.integrate import cumtrapz
-except Exception:
-    # Newer SciPy versions provide cumulative_trapezoid (use as a drop-in)
-    from scipy.integrate import cumulative_trapezoid as cumtrapz
-import matplotlib.pyplot as plt
-import csv
 from .supports import Support
-from ..loads.loads import Load, PointLoad, UniformDistributedLoad, UniformVaryingLoad, MomentLoad
+from .diagrams import (singularity_terms, reaction_terms, concatenate_terms, shear_moment_diagrams,
+                       deflection_diagrams, DiagramExtremes)
+from .combinations import factor_matrix, CaseResponses
+from .stiffness import BeamStiffness, snap_round_off
+from ..file_io.export import export_samples
+from ..loads.loads import Load, LoadSet, load_versions
 from ..utils.unit_conversion import UnitConversion
+from ..instrument import instrumented, count, recorder_for
 
 class Beam:
-    def __init__(self, length, beam_type, length_unit='mm'):
+    def __init__(self, length, beam_type, length_unit='mm', instrument=False):
+        """instrument records this beam's phases and cache counters.
+
+        True reports to bendrix.instrument.get_recorder(); a Recorder or a
+        path for a Chrome trace written at exit can be given instead.
+        """
         self.length = UnitConversion.convert(length, length_unit, 'mm')
         self.beam_type = beam_type
         self.supports = []
         self.loads = []
-        self.reactions_calculated = False
+        self.load_cases = []
+        self.flexural_rigidity = None
+        self._cache = {}
+        self._cache_fingerprint = None
+        self.instrument = recorder_for(instrument)
+        self._load_snapshot = (None, [], ())
 
     def add_support(self, support):
         if not isinstance(support, Support):
@@ -27,30 +35,245 @@ class Beam:
             raise ValueError("Support position must be within beam length")
         self.supports.append(support)
 
-    def add_load(self, load):
+    def add_load(self, load, case='default'):
+        """Add a load (or a whole LoadSet), optionally tagged with a load case name (e.g. 'dead')."""
         if not isinstance(load, Load):
             raise ValueError("Must add a valid Load instance")
+        valid = self.reactions_calculated
         self.loads.append(load)
+        self.load_cases.append(case)
+        if valid:
+            # Extend the current snapshot instead of fingerprinting every load again
+            versions, loads, states = self._load_snapshot
+            self._load_snapshot = (versions + load_versions([load]), loads + [load], states + (load.get_state(),))
+        self._apply_load_delta([load], [], valid)
+
+    def set_flexural_rigidity(self, ei, ei_unit='N*mm2', position_unit='mm'):
+        """Set EI for slope/deflection (and for indeterminate reactions).
+
+        ei is either one value for the whole beam or a list of
+        (start, end, value) segments covering the beam from 0 to length.
+        """
+        if np.ndim(ei) == 0:
+            self.flexural_rigidity = (np.zeros(1), np.array([UnitConversion.convert(float(ei), ei_unit, 'N*mm2')]))
+            return
+        segments = sorted((UnitConversion.convert(a, position_unit, 'mm'), UnitConversion.convert(b, position_unit, 'mm'),
+                           UnitConversion.convert(v, ei_unit, 'N*mm2')) for a, b, v in ei)
+        ends = [0.0] + [b for _, b, _ in segments]
+        if any(not np.isclose(a, e) for (a, _, _), e in zip(segments, ends)) or not np.isclose(ends[-1], self.length):
+            raise ValueError("Flexural rigidity segments must cover the beam without gaps")
+        if any(v <= 0 for _, _, v in segments):
+            raise ValueError("Flexural rigidity must be positive")
+        self.flexural_rigidity = (np.array([a for a, _, _ in segments]), np.array([v for _, _, v in segments]))
+
+    def remove_load(self, load):
+        for i, existing in enumerate(self.loads):
+            if existing is load:
+                valid = self.reactions_calculated
+                del self.loads[i]
+                if i < len(self.load_cases):
+                    del self.load_cases[i]
+                if valid:
+                    versions, loads, states = self._load_snapshot
+                    self._load_snapshot = (versions[:i] + versions[i + 1:], loads[:i] + loads[i + 1:],
+                                           states[:i] + states[i + 1:])
+                self._apply_load_delta([], [load], valid)
+                return
+        raise ValueError("Load is not on this beam")
+
+    def update_load(self, load, **changes):
+        """Change parameters of a load on the beam, e.g. update_load(p, position=1200.0).
+
+        Values are in the load's internal units (N, mm, N/mm, N*mm). Cached
+        reactions and SF/BM samples are corrected by the difference between
+        the new and the old load, so the cost does not grow with the number
+        of other loads; other cached results are rebuilt when next needed.
+        """
+        # The same object may be on the beam more than once
+        occurrences = sum(existing is load for existing in self.loads)
+        if not occurrences:
+            raise ValueError("Load is not on this beam")
+        if isinstance(load, LoadSet):
+            raise ValueError("Use the LoadSet add_* methods to change a LoadSet")
+        unknown = set(changes) - set(load.state_fields())
+        if unknown:
+            raise ValueError(f"Unknown load parameter(s): {', '.join(sorted(unknown))}")
+        valid = self.reactions_calculated
+        old = copy.copy(load)
+        for name, value in changes.items():
+            setattr(load, name, value)
+        if valid:
+            # The snapshot was current; only this load's states need redoing
+            _, loads, states = self._load_snapshot
+            state = load.get_state()
+            states = tuple(state if existing is load else old_state for existing, old_state in zip(loads, states))
+            self._load_snapshot = (load_versions(loads), loads, states)
+        self._apply_load_delta([load] * occurrences, [old] * occurrences, valid)
+
+    @instrumented('incremental_update')
+    def _apply_load_delta(self, added, removed, valid):
+        # Reactions and diagrams are linear in the loads: correct the cached
+        # results by the response to (added - removed) when they were current
+        if not valid:
+            return
+        forces, moments = self._cache['reactions']
+        positions = [s.position for s in self.supports]
+        coef, pos, order = singularity_terms(removed)
+        load_terms = concatenate_terms([singularity_terms(added), (-coef, pos, order)])
+        model = self._cache.get('stiffness')
+        if model is not None:
+            # Indeterminate beams: one solve of the net change
+            delta_f, delta_m = model.solve(load_terms)
+        else:
+            delta_f, delta_m = np.zeros(len(positions)), np.zeros(len(positions))
+            for loads, sign in ((added, 1.0), (removed, -1.0)):
+                if loads:
+                    f, m = self._solve_reactions(loads)
+                    delta_f += sign * np.asarray(f, dtype=float)
+                    delta_m += sign * np.asarray(m, dtype=float)
+        terms = concatenate_terms([load_terms, reaction_terms(positions, delta_f, delta_m)])
+        sf_delta, bm_delta = shear_moment_diagrams(self.length, terms)
+
+        forces, moments = np.asarray(forces) + delta_f, np.asarray(moments) + delta_m
+        if model is not None:
+            forces, moments = snap_round_off(forces), snap_round_off(moments)
+        kept = {'reactions': (forces.tolist(), moments.tolist())}
+        if 'stiffness' in self._cache:
+            kept['stiffness'] = self._cache['stiffness']
+        for key, value in self._cache.items():
+            if isinstance(key, tuple) and key[0] == 'samples':
+                x, sf, bm = value
+                sf, bm = sf + sf_delta(x), bm + bm_delta(x)
+                sf.flags.writeable = False
+                bm.flags.writeable = False
+                kept[key] = (x, sf, bm)
+        self._cache = kept
+        self._cache_fingerprint = self._fingerprint()
+        for s, force, moment in zip(self.supports, *kept['reactions']):
+            s.reaction_force = force
+            s.reaction_moment = moment
+
+    def remove_support(self, support):
+        for i, existing in enumerate(self.supports):
+            if existing is support:
+                del self.supports[i]
+                return
+        raise ValueError("Support is not on this beam")
+
+    def _case_labels(self):
+        # Loads appended to self.loads directly belong to the default case
+        labels = self.load_cases[:len(self.loads)]
+        return labels + ['default'] * (len(self.loads) - len(labels))
+
+    def get_load_cases(self):
+        return list(dict.fromkeys(self._case_labels()))
+
+    def _load_states(self):
+        # Reuse the per-load states while the list holds the same objects
+        # (identity checks are cheap); only loads whose version moved are
+        # fingerprinted again
+        versions, loads, states = self._load_snapshot
+        current = load_versions(self.loads)
+        if loads != self.loads:
+            states = tuple([l.get_state() for l in self.loads])
+        elif current != versions:
+            states = tuple([state if new == old else l.get_state()
+                            for l, state, new, old in zip(self.loads, states, current, versions)])
+        else:
+            return states
+        self._load_snapshot = (current, list(self.loads), states)
+        return states
+
+    def _fingerprint(self):
+        """Cheap snapshot of everything the analysis results depend on."""
+        return (self.length, self.beam_type,
+                tuple([s.get_state() for s in self.supports]),
+                self._load_states(),
+                tuple(self._case_labels()),
+                None if self.flexural_rigidity is None else tuple(map(tuple, self.flexural_rigidity)))
+
+    def _cached(self, key, compute):
+        """Return a memoized result, recomputing after any change to the model.
+
+        Adding, removing or mutating supports and loads changes the
+        fingerprint, which drops every cached result at once.
+        """
+        fingerprint = self._fingerprint()
+        if fingerprint != self._cache_fingerprint:
+            self._cache = {}
+            self._cache_fingerprint = fingerprint
+        if key not in self._cache:
+            count('cache_misses', owner=self)
+            self._cache[key] = compute()
+            # Solvers may sort the supports; that reorders but does not change the model
+            self._cache_fingerprint = self._fingerprint()
+        else:
+            count('cache_hits', owner=self)
+        return self._cache[key]
+
+    def invalidate(self):
+        """Drop every cached result; the next access recomputes from scratch."""
+        self._cache = {}
+        self._cache_fingerprint = None
+
+    @property
+    def reactions_calculated(self):
+        return 'reactions' in self._cache and self._cache_fingerprint == self._fingerprint()
+
+    @reactions_calculated.setter
+    def reactions_calculated(self, value):
+        # Older code forced a recompute with beam.reactions_calculated = False;
+        # results are computed on demand, so True has nothing to do
+        if not value:
+            self.invalidate()
 
     def calculate_reactions(self):
-        if self.reactions_calculated:
-            return self._get_reactions_dict()
+        forces, moments = self._cached('reactions', lambda: self._solve_reactions(self.loads))
+        for s, force, moment in zip(self.supports, forces, moments):
+            s.reaction_force = force
+            s.reaction_moment = moment
+        return self._get_reactions_dict()
+
+    @instrumented('reactions')
+    def _solve_reactions(self, loads):
+        """Return (forces, moments) lists in support order for the given loads."""
+        self.check_supports()
         if self.beam_type == 'simply_supported':
-            self._calc_simply_supported()
+            return self._calc_simply_supported(loads)
         elif self.beam_type == 'cantilever':
-            self._calc_cantilever()
+            return self._calc_cantilever(loads)
         elif self.beam_type == 'overhanging':
-            self._calc_overhanging()
+            return self._calc_overhanging(loads)
         elif self.beam_type == 'fixed':
-            self._calc_fixed()
+            return self._calc_fixed(loads)
         elif self.beam_type == 'continuous':
-            raise NotImplementedError("Continuous beams require advanced methods (e.g., moment distribution)")
+            return self._calc_continuous(loads)
+        else:
+            return self._calc_propped_cantilever(loads)
+
+    def check_supports(self):
+        """Raise ValueError unless the supports suit the beam type."""
+        supports = self.supports
+        if self.beam_type == 'simply_supported':
+            if len(supports) != 2 or supports[0].position != 0 or supports[1].position != self.length:
+                raise ValueError("Simply supported requires supports at 0 and length")
+        elif self.beam_type == 'cantilever':
+            if len(supports) != 1 or supports[0].position != 0 or supports[0].type != 'fixed':
+                raise ValueError("Cantilever requires fixed support at 0")
+        elif self.beam_type == 'overhanging':
+            if len(supports) != 2:
+                raise ValueError("Overhanging requires two supports")
+        elif self.beam_type == 'fixed':
+            if len(supports) != 2 or supports[0].position != 0 or supports[1].position != self.length:
+                raise ValueError("Fixed beam requires fixed supports at 0 and length")
+        elif self.beam_type == 'continuous':
+            if len(supports) < 2:
+                raise ValueError("Continuous beam requires at least two supports")
         elif self.beam_type == 'propped_cantilever':
-            self._calc_propped_cantilever()
+            if len(supports) != 2 or supports[0].position != 0 or supports[0].type != 'fixed' or supports[1].type != 'roller':
+                raise ValueError("Propped cantilever: fixed at 0, roller at length")
         else:
             raise ValueError(f"Unsupported beam type: {self.beam_type}")
-        self.reactions_calculated = True
-        return self._get_reactions_dict()
 
     def _get_reactions_dict(self):
         reactions = {}
@@ -63,138 +286,204 @@ class Beam:
             reactions[key] = value
         return reactions
 
-    def _calc_simply_supported(self):
-        if len(self.supports) != 2 or self.supports[0].position != 0 or self.supports[1].position != self.length:
-            raise ValueError("Simply supported requires supports at 0 and length")
+    def _calc_simply_supported(self, loads):
         self.supports.sort(key=lambda s: s.position)
-        A, B = self.supports
-        total_force = sum(load.get_total_force() for load in self.loads)
-        sum_ma = sum(load.get_moment_about(A.position) for load in self.loads)
-        span = B.position - A.position
-        B.reaction_force = sum_ma / span
-        A.reaction_force = total_force - B.reaction_force
-
-    def _calc_cantilever(self):
-        if len(self.supports) != 1 or self.supports[0].position != 0 or self.supports[0].type != 'fixed':
-            raise ValueError("Cantilever requires fixed support at 0")
-        fixed = self.supports[0]
-        total_force = sum(load.get_total_force() for load in self.loads)
-        sum_m = sum(load.get_moment_about(0) for load in self.loads)
-        fixed.reaction_force = total_force
-        fixed.reaction_moment = -sum_m
-
-    def _calc_overhanging(self):
-        if len(self.supports) != 2:
-            raise ValueError("Overhanging requires two supports")
+        return self._calc_two_supports(loads)
+
+    def _calc_cantilever(self, loads):
+        total_force = sum(load.get_total_force() for load in loads)
+        sum_m = sum(load.get_moment_about(0) for load in loads)
+        return [total_force], [-sum_m]
+
+    def _calc_overhanging(self, loads):
         self.supports.sort(key=lambda s: s.position)
+        return self._calc_two_supports(loads)
+
+    def _calc_two_supports(self, loads):
         A, B = self.supports
-        total_force = sum(load.get_total_force() for load in self.loads)
-        sum_ma = sum(load.get_moment_about(A.position) for load in self.loads)
+        total_force = sum(load.get_total_force() for load in loads)
+        sum_ma = sum(load.get_moment_about(A.position) for load in loads)
         span = B.position - A.position
-        B.reaction_force = sum_ma / span
-        A.reaction_force = total_force - B.reaction_force
-
-    def _calc_fixed(self):
-        if len(self.supports) != 2 or self.supports[0].position != 0 or self.supports[1].position != self.length:
-            raise ValueError("Fixed beam requires fixed supports at 0 and length")
-        if len(self.loads) != 1 or not isinstance(self.loads[0], UniformDistributedLoad):
-            raise ValueError("Fixed beam calculation simplified for single UDL only")
+        rb = sum_ma / span
+        return [total_force - rb, rb], [0.0, 0.0]
+
+    def _calc_fixed(self, loads):
         self.supports.sort(key=lambda s: s.position)
-        A, B = self.supports
-        udl = self.loads[0]
-        w = udl.magnitude
-        L = self.length
-        A.reaction_force = B.reaction_force = (w * L) / 2
-        A.reaction_moment = - (w * L ** 2) / 12
-        B.reaction_moment = - (w * L ** 2) / 12
-
-    def _calc_propped_cantilever(self):
-        if len(self.supports) != 2 or self.supports[0].position != 0 or self.supports[0].type != 'fixed' or self.supports[1].type != 'roller':
-            raise ValueError("Propped cantilever: fixed at 0, roller at length")
-        if len(self.loads) != 1 or not isinstance(self.loads[0], UniformDistributedLoad):
-            raise ValueError("Propped cantilever simplified for single UDL")
-        fixed, prop = self.supports if self.supports[0].position == 0 else self.supports[::-1]
-        udl = self.loads[0]
-        w = udl.magnitude
-        L = self.length
-        rp = (3 * w * L) / 8
-        rf = (w * L) - rp
-        mf = - (w * L ** 2) / 8
-        fixed.reaction_force = rf
-        fixed.reaction_moment = mf
-        prop.reaction_force = rp
+        return self._calc_stiffness(loads)
 
+    def _calc_propped_cantilever(self, loads):
+        return self._calc_stiffness(loads)
+
+    def _calc_continuous(self, loads):
+        self.supports.sort(key=lambda s: s.position)
+        return self._calc_stiffness(loads)
+
+    def _calc_stiffness(self, loads):
+        # Statically indeterminate: solve with beam elements and fixed-end actions
+        # The factorized model depends only on supports and EI, so it is kept
+        # with the other cached results and reused for every load change
+        model = self._cache.get('stiffness')
+        if model is None:
+            rigidity = 1.0 if self.flexural_rigidity is None else self.flexural_rigidity
+            model = self._cache['stiffness'] = BeamStiffness(self.length, self.supports, rigidity)
+        forces, moments = model.solve(singularity_terms(loads))
+        return snap_round_off(forces).tolist(), snap_round_off(moments).tolist()
+
+    @instrumented('shear_sampling')
     def _compute_shear_at(self, x):
         self.calculate_reactions()
-        reac_cum = sum(s.reaction_force for s in self.supports if s.position <= x)
+        x = np.asarray(x, dtype=float)
+        count('load_evaluations', len(self.loads))
+        reac_cum = sum(np.where(x >= s.position, s.reaction_force, 0.0) for s in self.supports)
         load_cum = sum(load.get_cumulative_force_up_to(x) for load in self.loads)
-        return reac_cum - load_cum
+        sf = reac_cum - load_cum + np.zeros(x.shape)
+        return float(sf) if sf.ndim == 0 else sf
+
+    def get_diagrams(self):
+        """Return exact (shear force, bending moment) piecewise polynomials.
+
+        Both are PiecewisePolynomial objects with breakpoints at every load and
+        support position, evaluable at any x in mm.
+        """
+        self.calculate_reactions()
+        return self._cached('diagrams', self._compute_diagrams)
+
+    @instrumented('diagrams')
+    def _compute_diagrams(self):
+        return shear_moment_diagrams(self.length, singularity_terms(self.loads, self.supports))
+
+    @instrumented('evaluate')
+    def evaluate(self, x):
+        """Return shear force and bending moment arrays at positions x (mm).
+
+        Values come from the exact diagrams, so they do not depend on how many
+        points are requested. Inside the beam, values at a load position include
+        that load; at the right end the left limit is returned.
+        """
+        sf, bm = self.get_diagrams()
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        count('points_evaluated', x.size)
+        return sf(x), bm(x)
+
+    def extremes(self):
+        """Return exact DiagramExtremes: max/min SF and BM, zero shear, contraflexure.
+
+        Found analytically from the diagram polynomials, so no sampling is
+        needed and peaks under point loads are never missed. Per-segment
+        values are available on the returned object.
+        """
+        return self._cached('extremes', lambda: DiagramExtremes(*self.get_diagrams()))
+
+    def get_deflection_diagrams(self):
+        """Return exact (slope, deflection) piecewise polynomials.
+
+        Slope is in radians and deflection in mm, positive upward. Requires
+        set_flexural_rigidity.
+        """
+        if self.flexural_rigidity is None:
+            raise ValueError("Flexural rigidity not set; call set_flexural_rigidity first")
+        return self._cached('deflection', self._compute_deflection)
+
+    @instrumented('deflection')
+    def _compute_deflection(self):
+        _, bm = self.get_diagrams()
+        fixed = [s.position for s in self.supports if s.type == 'fixed']
+        return deflection_diagrams(bm, self.flexural_rigidity, [s.position for s in self.supports], fixed)
+
+    def evaluate_deflection(self, x):
+        """Return slope and deflection arrays at positions x (mm)."""
+        slope, deflection = self.get_deflection_diagrams()
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        return slope(x), deflection(x)
+
+    def max_deflection(self):
+        """Return (deflection, position) of the largest deflection magnitude."""
+        def compute():
+            _, deflection = self.get_deflection_diagrams()
+            high, high_at, low, low_at = deflection.piece_extrema()
+            i, j = np.argmax(high), np.argmin(low)
+            if abs(high[i]) > abs(low[j]):
+                return float(high[i]), float(high_at[i])
+            return float(low[j]), float(low_at[j])
+        return self._cached('max_deflection', compute)
 
+    @instrumented('sampling')
+    def get_samples(self, num_points=200):
+        """Return cached (x, sf, bm) arrays on an even grid of num_points.
+
+        The arrays are shared between callers (plots, exports) and therefore
+        read-only.
+        """
+        def sample():
+            x = np.linspace(0, self.length, num_points)
+            sf, bm = self.evaluate(x)
+            for a in (x, sf, bm):
+                a.flags.writeable = False
+            return x, sf, bm
+        self.calculate_reactions()
+        return self._cached(('samples', num_points), sample)
+
+    def get_case_responses(self, num_points=200):
+        """Return the cached unit-factor response of every load case.
+
+        Each case's reactions and SF/BM at num_points positions are computed
+        once; combinations are then linear combinations of these rows.
+        """
+        return self._cached(('case_responses', num_points), lambda: self._compute_case_responses(num_points))
+
+    @instrumented('load_cases')
+    def _compute_case_responses(self, num_points):
+        cases = self.get_load_cases()
+        x = np.linspace(0, self.length, num_points)
+        positions = [s.position for s in self.supports]
+        forces, moments, sf, bm = [], [], [], []
+        for case in cases:
+            loads = [l for l, c in zip(self.loads, self._case_labels()) if c == case]
+            f, m = self._solve_reactions(loads)
+            terms = concatenate_terms([singularity_terms(loads), reaction_terms(positions, f, m)])
+            sf_case, bm_case = shear_moment_diagrams(self.length, terms)
+            forces.append(f)
+            moments.append(m)
+            sf.append(sf_case(x))
+            bm.append(bm_case(x))
+        shape = (len(cases), len(self.supports))
+        return CaseResponses(cases, x, np.reshape(forces, shape), np.reshape(moments, shape),
+                             np.reshape(sf, (len(cases), num_points)), np.reshape(bm, (len(cases), num_points)))
+
+    @instrumented('combinations')
+    def analyze_combinations(self, combinations, num_points=200):
+        """Analyze factored load combinations by superposition.
+
+        combinations maps a combination name to {case: factor}, e.g.
+        {'ULS1': {'dead': 1.35, 'live': 1.5}}. Returns a CombinationResult with
+        reactions and SF/BM for every combination plus the max/min envelope.
+        """
+        responses = self.get_case_responses(num_points)
+        names, factors = factor_matrix(combinations, responses.cases)
+        return responses.combine(names, factors)
+
+    @instrumented('plot')
     def plot_diagrams(self, num_points=200, save_path=None, show=True):
         """Plot shear force and bending moment diagrams.
 
         If save_path is provided, the figure will be saved instead of (or in
         addition to) being shown. save_path may be a directory or a file path.
         The beam type is included in the plot titles and default filenames.
+        Matplotlib is only imported here, see bendrix.plotting.diagrams.
         """
-        self.calculate_reactions()
-        x = np.linspace(0, self.length, num_points)
-        sf = np.array([self._compute_shear_at(xi) for xi in x])
-        bm0 = 0
-        left_support = min(self.supports, key=lambda s: s.position, default=None)
-        if left_support and left_support.position == 0 and left_support.type == 'fixed':
-            bm0 = left_support.reaction_moment
-        bm = bm0 + cumtrapz(sf, x, initial=0)
-        cum_mom = np.array([sum(l.get_cumulative_moment_up_to(xi) for l in self.loads) for xi in x])
-        bm += cum_mom
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
-        ax1.plot(x, sf, label='Shear Force')
-        # include beam type in titles
-        beam_title = (self.beam_type or '').replace('_', ' ').title()
-        ax1.set_title(f"{beam_title} — Shear Force Diagram")
-        ax1.set_xlabel('Position (mm)')
-        ax1.set_ylabel('SF (N)')
-        ax1.grid(True)
-        ax2.plot(x, bm, label='Bending Moment')
-        ax2.set_title(f"{beam_title} — Bending Moment Diagram")
-        ax2.set_xlabel('Position (mm)')
-        ax2.set_ylabel('BM (N*mm)')
-        ax2.grid(True)
-        plt.tight_layout()
-
-        if save_path:
-            # If a directory is given, construct a default filename
-            if os.path.isdir(save_path) or save_path.endswith(os.sep):
-                out_dir = save_path
-                os.makedirs(out_dir, exist_ok=True)
-                safe_name = (self.beam_type or 'beam').replace(' ', '_')
-                out_file = os.path.join(out_dir, f"{safe_name}_sf_bm.png")
-            else:
-                # treat as file path (ensure parent dir exists)
-                out_file = save_path
-                parent = os.path.dirname(out_file)
-                if parent:
-                    os.makedirs(parent, exist_ok=True)
-            fig.savefig(out_file)
-            if not show:
-                plt.close(fig)
-        else:
-            if show:
-                plt.show()
+        from ..plotting.diagrams import plot_beam_diagrams
+        return plot_beam_diagrams(self, num_points=num_points, save_path=save_path, show=show)
+
+    def export_sf_bm_to_csv(self, filename, num_points=20, float_format='%r'):
+        # Same output as the csv.writer version: full-precision values, CRLF rows
+        return self.export_sf_bm(filename, num_points, fmt='csv', float_format=float_format, line_terminator='\r\n')
+
+    @instrumented('export')
+    def export_sf_bm(self, filename, num_points=200, fmt=None, **options):
+        """Stream SF/BM samples to a csv, npy or npz file (format from the extension).
 
-    def export_sf_bm_to_csv(self, filename, num_points=20):
+        See bendrix.file_io.export; samples are written in chunks, so large
+        num_points do not need the whole table in memory.
+        """
         self.calculate_reactions()
-        x = np.linspace(0, self.length, num_points)
-        sf = np.array([self._compute_shear_at(xi) for xi in x])
-        bm0 = 0
-        left_support = min(self.supports, key=lambda s: s.position, default=None)
-        if left_support and left_support.position == 0 and left_support.type == 'fixed':
-            bm0 = left_support.reaction_moment
-        bm = bm0 + cumtrapz(sf, x, initial=0)
-        cum_mom = np.array([sum(l.get_cumulative_moment_up_to(xi) for l in self.loads) for xi in x])
-        bm += cum_mom
-        with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Position (mm)', 'Shear Force (N)', 'Bending Moment (N*mm)'])
-            for xi, sfi, bmi in zip(x, sf, bm):
-                writer.writerow([xi, sfi, bmi])
\ No newline at end of file
+        return export_samples(self, filename, num_points, fmt, **options)
\ No newline at end of file
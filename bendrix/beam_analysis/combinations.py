@@ -0,0 +1,67 @@
+import numpy as np
+
+
+def factor_matrix(combinations, cases):
+    """Turn {combination: {case: factor}} into names and a (combinations, cases) array."""
+    names = list(combinations)
+    if not names:
+        raise ValueError("At least one load combination is required")
+    factors = np.zeros((len(names), len(cases)))
+    index = {case: i for i, case in enumerate(cases)}
+    for row, name in enumerate(names):
+        for case, factor in combinations[name].items():
+            if case not in index:
+                raise ValueError(f"Combination '{name}' refers to unknown load case '{case}'")
+            factors[row, index[case]] = factor
+    return names, factors
+
+
+class CaseResponses:
+    """Reactions and SF/BM of every load case under unit factor.
+
+    Rows follow `cases`; sf and bm are sampled at positions x (mm).
+    """
+
+    def __init__(self, cases, x, reaction_forces, reaction_moments, sf, bm):
+        self.cases = cases
+        self.x = x
+        self.reaction_forces = reaction_forces
+        self.reaction_moments = reaction_moments
+        self.sf = sf
+        self.bm = bm
+
+    def combine(self, names, factors):
+        factors = np.asarray(factors, dtype=float)
+        return CombinationResult(names, self.cases, factors, self.x,
+                                 factors @ self.reaction_forces, factors @ self.reaction_moments,
+                                 factors @ self.sf, factors @ self.bm)
+
+
+class CombinationResult:
+    """Results of many load combinations plus their envelope.
+
+    Arrays are indexed (combination, support) for reactions and
+    (combination, position) for sf and bm. The envelope holds the max/min over
+    all combinations at every position, with the governing combination index.
+    """
+
+    def __init__(self, names, cases, factors, x, reaction_forces, reaction_moments, sf, bm):
+        self.names = names
+        self.cases = cases
+        self.factors = factors
+        self.x = x
+        self.reaction_forces = reaction_forces
+        self.reaction_moments = reaction_moments
+        self.sf = sf
+        self.bm = bm
+        if not len(names):
+            raise ValueError("At least one load combination is required")
+        self.sf_max, self.sf_min = sf.max(axis=0), sf.min(axis=0)
+        self.bm_max, self.bm_min = bm.max(axis=0), bm.min(axis=0)
+        self.sf_max_combination, self.sf_min_combination = sf.argmax(axis=0), sf.argmin(axis=0)
+        self.bm_max_combination, self.bm_min_combination = bm.argmax(axis=0), bm.argmin(axis=0)
+
+    def get_combination(self, name):
+        """Return (reaction forces, reaction moments, sf, bm) of one combination."""
+        i = self.names.index(name)
+        return self.reaction_forces[i], self.reaction_moments[i], self.sf[i], self.bm[i]
@@ -0,0 +1,298 @@
+import math
+import numpy as np
+from ..instrument import count
+
+
+class PiecewisePolynomial:
+    """Polynomial pieces between sorted breakpoints.
+
+    Piece i covers [breakpoints[i], breakpoints[i + 1]) and stores its
+    coefficients in ascending powers of the local coordinate
+    t = x - breakpoints[i]. Evaluation bisects the breakpoints, so any x costs
+    O(log n) regardless of how many loads built the diagram.
+    """
+
+    def __init__(self, breakpoints, coefficients):
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.coefficients = np.atleast_2d(np.asarray(coefficients, dtype=float))
+        if len(self.breakpoints) != len(self.coefficients) + 1:
+            raise ValueError("Need exactly one coefficient row per piece")
+
+    def locate(self, x, side='right'):
+        """Return the piece index for each x.
+
+        side='right' gives right-continuous values at breakpoints (a point load
+        at x is already included), side='left' gives the limit from the left.
+        """
+        idx = np.searchsorted(self.breakpoints, x, side=side) - 1
+        return np.clip(idx, 0, len(self.coefficients) - 1)
+
+    def __call__(self, x, side='right'):
+        x = np.asarray(x, dtype=float)
+        idx = self.locate(x, side)
+        t = x - self.breakpoints[idx]
+        coef = self.coefficients[idx]
+        # Horner's scheme over the (small) polynomial degree
+        values = coef[..., -1]
+        for j in range(coef.shape[-1] - 2, -1, -1):
+            values = values * t + coef[..., j]
+        return float(values) if values.ndim == 0 else values
+
+    def piece_end_values(self):
+        """Values at the right end of every piece (left limits at breakpoints[1:])."""
+        h = np.diff(self.breakpoints)
+        powers = h[:, None] ** np.arange(self.coefficients.shape[1])
+        return np.sum(self.coefficients * powers, axis=1)
+
+    def derivative(self):
+        k = self.coefficients.shape[1]
+        if k == 1:
+            return PiecewisePolynomial(self.breakpoints, np.zeros_like(self.coefficients))
+        coef = self.coefficients[:, 1:] * np.arange(1, k)
+        return PiecewisePolynomial(self.breakpoints, coef)
+
+    def refine(self, points):
+        """Return the same function with extra breakpoints inserted at points."""
+        points = np.asarray(points, dtype=float)
+        inside = points[(points > self.breakpoints[0]) & (points < self.breakpoints[-1])]
+        breakpoints = np.union1d(self.breakpoints, inside)
+        starts = breakpoints[:-1]
+        parent = self.locate(starts)
+        shift = starts - self.breakpoints[parent]
+        old = self.coefficients[parent]
+        k = old.shape[1]
+        # Taylor shift of every parent polynomial to the new piece start
+        coef = np.zeros_like(old)
+        for j in range(k):
+            for m in range(j, k):
+                coef[:, j] += old[:, m] * math.comb(m, j) * shift ** (m - j)
+        return PiecewisePolynomial(breakpoints, coef)
+
+    def integrate(self, jumps=None):
+        """Return the running integral starting from zero at breakpoints[0].
+
+        jumps[i] is added at breakpoints[i] on top of the integral, which is how
+        point forces enter the shear and couples enter the bending moment.
+        """
+        n = len(self.coefficients)
+        coef = np.zeros((n, self.coefficients.shape[1] + 1))
+        coef[:, 1:] = self.coefficients / np.arange(1, self.coefficients.shape[1] + 1)
+        jumps = np.zeros(n) if jumps is None else np.asarray(jumps, dtype=float)[:n]
+        increments = PiecewisePolynomial(self.breakpoints, coef).piece_end_values()
+        coef[:, 0] = np.cumsum(jumps + np.concatenate(([0.0], increments[:-1])))
+        return PiecewisePolynomial(self.breakpoints, coef)
+
+    def piece_roots(self):
+        """Return (piece index, x) of the real roots inside each closed piece.
+
+        Roots are found analytically per piece: directly for linear pieces and
+        from companion-matrix eigenvalues otherwise, grouped by degree so all
+        pieces of a degree are solved in one call. Pieces that vanish
+        identically have no isolated roots and are skipped.
+        """
+        h = np.diff(self.breakpoints)
+        # Scale to s = t / h in [0, 1] so the tolerance is relative
+        a = self.coefficients * h[:, None] ** np.arange(self.coefficients.shape[1])
+        scale = np.max(np.abs(a), axis=1)
+        significant = np.abs(a) > 1e-12 * scale[:, None]
+        degree = np.where(significant.any(axis=1),
+                          a.shape[1] - 1 - np.argmax(significant[:, ::-1], axis=1), 0)
+        pieces, roots = [], []
+        for d in range(1, a.shape[1]):
+            idx = np.nonzero(degree == d)[0]
+            if not len(idx):
+                continue
+            monic = a[idx, :d] / a[idx, d:d + 1]
+            if d == 1:
+                r = -monic
+            else:
+                companion = np.zeros((len(idx), d, d))
+                companion[:, 0, :] = -monic[:, ::-1]
+                companion[:, np.arange(1, d), np.arange(d - 1)] = 1.0
+                r = np.linalg.eigvals(companion)
+            real = np.abs(np.imag(r)) <= 1e-9
+            r = np.real(r)
+            inside = real & (r >= -1e-12) & (r <= 1 + 1e-12)
+            rows, cols = np.nonzero(inside)
+            pieces.append(idx[rows])
+            roots.append(self.breakpoints[idx[rows]] + np.clip(r[rows, cols], 0, 1) * h[idx[rows]])
+        if not pieces:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        return np.concatenate(pieces), np.concatenate(roots)
+
+    def piece_extrema(self):
+        """Return per-piece (max, max position, min, min position) arrays.
+
+        Candidates are both piece ends and the roots of the derivative, so the
+        values are exact rather than sampled.
+        """
+        n = len(self.coefficients)
+        starts, ends = self.breakpoints[:-1], self.breakpoints[1:]
+        idx, x = self.derivative().piece_roots()
+        idx = np.concatenate((np.arange(n), np.arange(n), idx))
+        x = np.concatenate((starts, ends, x))
+        t = x - self.breakpoints[idx]
+        coef = self.coefficients[idx]
+        values = coef[:, -1]
+        for j in range(coef.shape[1] - 2, -1, -1):
+            values = values * t + coef[:, j]
+        order = np.lexsort((values, idx))
+        first = np.searchsorted(idx[order], np.arange(n), side='left')
+        last = np.searchsorted(idx[order], np.arange(n), side='right') - 1
+        return values[order][last], x[order][last], values[order][first], x[order][first]
+
+    def sign_changes(self):
+        """Positions where the function changes sign, inside pieces or by a jump."""
+        span = self.breakpoints[-1] - self.breakpoints[0]
+        delta = 1e-9 * span if span else 1e-9
+        _, roots = self.piece_roots()
+        candidates = np.unique(np.concatenate((roots, self.breakpoints[1:-1])))
+        candidates = candidates[(candidates > self.breakpoints[0]) & (candidates < self.breakpoints[-1])]
+        left = self(candidates - delta)
+        right = self(candidates + delta)
+        return candidates[np.sign(left) * np.sign(right) < 0]
+
+
+def singularity_terms(loads, supports=()):
+    """Collect the singularity (Macaulay) terms of loads and support reactions.
+
+    Returns coefficient, position and order arrays; see
+    Load.get_singularity_terms for the convention.
+    """
+    parts = [load.get_singularity_terms() for load in loads]
+    count('load_evaluations', len(parts))
+    if supports:
+        parts.append(reaction_terms([s.position for s in supports],
+                                    [s.reaction_force for s in supports],
+                                    [s.reaction_moment for s in supports]))
+    return concatenate_terms(parts)
+
+
+def reaction_terms(positions, forces, moments):
+    """Singularity terms of upward reaction forces and clockwise reaction couples."""
+    positions = np.asarray(positions, dtype=float)
+    order = np.repeat([[0, -1]], len(positions), axis=0).ravel()
+    coef = np.column_stack((forces, moments)).ravel()
+    return coef, np.repeat(positions, 2), order
+
+
+def concatenate_terms(parts):
+    if not parts:
+        return np.zeros(0), np.zeros(0), np.zeros(0, dtype=int)
+    coef = np.concatenate([np.asarray(p[0], dtype=float) for p in parts])
+    pos = np.concatenate([np.asarray(p[1], dtype=float) for p in parts])
+    order = np.concatenate([np.asarray(p[2], dtype=int) for p in parts])
+    return coef, pos, order
+
+
+def breakpoints_for(length, positions):
+    inside = positions[(positions > 0) & (positions < length)]
+    return np.unique(np.concatenate(([0.0, float(length)], inside)))
+
+
+def distributed_intensity(breakpoints, terms):
+    """Piecewise-linear dV/dx (upward load intensity) between breakpoints."""
+    coef, pos, order = terms
+    if np.any(order > 2) or np.any(order < -1):
+        raise ValueError("Singularity terms must have order -1, 0, 1 or 2")
+    sort = np.argsort(pos, kind='stable')
+    coef, pos, order = coef[sort], pos[sort], order[sort]
+    starts = breakpoints[:-1]
+    # Prefix sums over the terms active (position <= piece start) for each piece
+    active = np.searchsorted(pos, starts, side='right')
+    steps = np.concatenate(([0.0], np.cumsum(np.where(order == 1, coef, 0.0))))
+    ramps = np.concatenate(([0.0], np.cumsum(np.where(order == 2, coef, 0.0))))
+    ramp_moments = np.concatenate(([0.0], np.cumsum(np.where(order == 2, coef * pos, 0.0))))
+    q0 = steps[active] + starts * ramps[active] - ramp_moments[active]
+    q1 = ramps[active]
+    return PiecewisePolynomial(breakpoints, np.column_stack((q0, q1)))
+
+
+def point_jumps(breakpoints, terms, order):
+    """Sum of the given order's terms located at each breakpoint."""
+    coef, pos, orders = terms
+    pick = orders == order
+    idx = np.clip(np.searchsorted(breakpoints, pos[pick]), 0, len(breakpoints) - 1)
+    return np.bincount(idx, weights=coef[pick], minlength=len(breakpoints))
+
+
+def shear_moment_diagrams(length, terms):
+    """Build exact shear force and bending moment diagrams from singularity terms.
+
+    Breakpoints sit at both beam ends and at every load and support position,
+    so the returned polynomials are exact everywhere along the beam.
+    """
+    terms = tuple(np.asarray(t) for t in terms)
+    breakpoints = breakpoints_for(length, terms[1])
+    q = distributed_intensity(breakpoints, terms)
+    sf = q.integrate(point_jumps(breakpoints, terms, 0))
+    bm = sf.integrate(point_jumps(breakpoints, terms, -1))
+    return sf, bm
+
+
+def deflection_diagrams(bm, rigidity, support_positions, fixed_positions):
+    """Slope and deflection from the bending moment by double integration.
+
+    rigidity is a (breakpoints, values) pair describing piecewise-constant
+    EI. The two integration constants are chosen so that deflection is zero
+    at every support and slope is zero at every fixed support (least
+    squares, which is exact when the reactions came from the same EI).
+    Deflection is positive upward.
+    """
+    ei_breaks, ei_values = rigidity
+    curvature = bm.refine(ei_breaks)
+    mid = 0.5 * (curvature.breakpoints[:-1] + curvature.breakpoints[1:])
+    ei = ei_values[np.clip(np.searchsorted(ei_breaks, mid, side='right') - 1, 0, len(ei_values) - 1)]
+    curvature = PiecewisePolynomial(curvature.breakpoints, curvature.coefficients / ei[:, None])
+    slope = curvature.integrate()
+    deflection = slope.integrate()
+
+    support_positions = np.asarray(support_positions, dtype=float)
+    fixed_positions = np.asarray(fixed_positions, dtype=float)
+    rows = np.vstack((np.column_stack((support_positions, np.ones(len(support_positions)))),
+                      np.column_stack((np.ones(len(fixed_positions)), np.zeros(len(fixed_positions))))))
+    rhs = -np.concatenate((np.atleast_1d(deflection(support_positions)), np.atleast_1d(slope(fixed_positions))))
+    if len(rows) < 2 or np.linalg.matrix_rank(rows) < 2:
+        raise ValueError("Supports do not fix the deflection constants")
+    (c1, c2), *_ = np.linalg.lstsq(rows, rhs, rcond=None)
+
+    slope.coefficients[:, 0] += c1
+    deflection.coefficients[:, 0] += c1 * deflection.breakpoints[:-1] + c2
+    deflection.coefficients[:, 1] += c1
+    return slope, deflection
+
+
+class DiagramExtremes:
+    """Exact extreme values of a shear force / bending moment diagram pair.
+
+    Positions are in mm. zero_shear_positions include sign changes of the
+    shear across point loads; contraflexure_positions are where the bending
+    moment changes sign. The segment_* arrays hold the same extremes for
+    every piece between consecutive breakpoints (segment_starts/ends).
+    """
+
+    def __init__(self, sf, bm):
+        self.segment_starts = sf.breakpoints[:-1]
+        self.segment_ends = sf.breakpoints[1:]
+        (self.segment_max_shear, self.segment_max_shear_position,
+         self.segment_min_shear, self.segment_min_shear_position) = sf.piece_extrema()
+        (self.segment_max_moment, self.segment_max_moment_position,
+         self.segment_min_moment, self.segment_min_moment_position) = bm.piece_extrema()
+        i, j = np.argmax(self.segment_max_shear), np.argmin(self.segment_min_shear)
+        self.max_shear, self.max_shear_position = self.segment_max_shear[i], self.segment_max_shear_position[i]
+        self.min_shear, self.min_shear_position = self.segment_min_shear[j], self.segment_min_shear_position[j]
+        i, j = np.argmax(self.segment_max_moment), np.argmin(self.segment_min_moment)
+        self.max_moment, self.max_moment_position = self.segment_max_moment[i], self.segment_max_moment_position[i]
+        self.min_moment, self.min_moment_position = self.segment_min_moment[j], self.segment_min_moment_position[j]
+        self.zero_shear_positions = sf.sign_changes()
+        self.contraflexure_positions = bm.sign_changes()
+
+    def as_dict(self):
+        return {
+            'max_shear': (float(self.max_shear), float(self.max_shear_position)),
+            'min_shear': (float(self.min_shear), float(self.min_shear_position)),
+            'max_moment': (float(self.max_moment), float(self.max_moment_position)),
+            'min_moment': (float(self.min_moment), float(self.min_moment_position)),
+            'zero_shear_positions': self.zero_shear_positions.tolist(),
+            'contraflexure_positions': self.contraflexure_positions.tolist(),
+        }
@@ -0,0 +1,116 @@
+import numpy as np
+from .stiffness import BeamStiffness
+
+
+class InfluenceLines:
+    """Influence lines of a beam for a unit downward load.
+
+    The beam's stiffness matrix is factorized once; every load position is
+    one extra right-hand side of the same banded solve, so evaluating
+    thousands of positions costs about as much as a few analyses. Reactions
+    follow the order of beam.supports.
+    """
+
+    def __init__(self, beam):
+        self.length = beam.length
+        rigidity = 1.0 if beam.flexural_rigidity is None else beam.flexural_rigidity
+        self.model = BeamStiffness(beam.length, beam.supports, rigidity)
+        self.support_positions = self.model.support_positions
+
+    def reactions(self, positions):
+        """Return (forces, moments), each (supports, positions), for a unit load."""
+        positions = np.asarray(positions, dtype=float)
+        _, residual = self.model.solve_nodal(self.model.unit_point_loads(positions.ravel()))
+        forces, moments = self.model.reactions_from_residual(residual)
+        shape = (len(self.support_positions),) + positions.shape
+        return forces.reshape(shape), moments.reshape(shape)
+
+    def section_responses(self, sections, positions, reactions=None):
+        """Return (shear, moment) influence values, each (sections, positions).
+
+        Values follow Beam.evaluate: a load or support exactly at a section
+        counts as left of it, except at the right end of the beam where the
+        left limit is taken. reactions may pass in the result of
+        self.reactions(positions) to avoid solving twice.
+        """
+        sections = np.asarray(sections, dtype=float)
+        positions = np.asarray(positions, dtype=float)
+        forces, moments = self.reactions(positions) if reactions is None else reactions
+        at_end = sections >= self.length
+        left = np.where(at_end[None, :], self.support_positions[:, None] < sections[None, :],
+                        self.support_positions[:, None] <= sections[None, :]).astype(float)
+        arm = left * (sections[None, :] - self.support_positions[:, None])
+        loaded = np.where(at_end[:, None], positions[None, :] < sections[:, None],
+                          positions[None, :] <= sections[:, None])
+        shear = left.T @ forces - loaded
+        moment = arm.T @ forces + left.T @ moments - loaded * (sections[:, None] - positions[None, :])
+        return shear, moment
+
+    def shear(self, sections, positions):
+        return self.section_responses(sections, positions)[0]
+
+    def moment(self, sections, positions):
+        return self.section_responses(sections, positions)[1]
+
+
+class MovingLoadEnvelope:
+    """Extreme SF/BM at each section, and reactions, over all train positions.
+
+    sf and bm are (sections, lead positions); *_position arrays give the lead
+    axle position that governs each extreme.
+    """
+
+    def __init__(self, sections, lead_positions, sf, bm, reaction_forces):
+        self.sections = sections
+        self.lead_positions = lead_positions
+        self.sf = sf
+        self.bm = bm
+        self.reaction_forces = reaction_forces
+        self.sf_max, self.sf_min = sf.max(axis=1), sf.min(axis=1)
+        self.bm_max, self.bm_min = bm.max(axis=1), bm.min(axis=1)
+        self.sf_max_position = lead_positions[sf.argmax(axis=1)]
+        self.sf_min_position = lead_positions[sf.argmin(axis=1)]
+        self.bm_max_position = lead_positions[bm.argmax(axis=1)]
+        self.bm_min_position = lead_positions[bm.argmin(axis=1)]
+        self.reaction_max = reaction_forces.max(axis=1)
+        self.reaction_min = reaction_forces.min(axis=1)
+
+
+def moving_load_envelope(beam, axles, sections=None, num_positions=200, both_directions=False):
+    """Envelope of SF/BM for a train of PointLoads rolling across the beam.
+
+    axles are PointLoad objects whose positions fix the axle spacing; the
+    train is moved so that its first axle travels in num_positions steps
+    from the point where the last axle enters the beam to where the first
+    axle leaves it. Axles off the beam carry no load. With both_directions
+    the reversed train is appended, so the second half of lead_positions
+    belongs to the train running the other way.
+    """
+    if not axles:
+        raise ValueError("Moving load needs at least one axle")
+    if sections is None:
+        sections = np.linspace(0, beam.length, 101)
+    sections = np.asarray(sections, dtype=float)
+    weights = np.array([a.magnitude for a in axles], dtype=float)
+    offsets = np.array([a.position for a in axles], dtype=float)
+    offsets -= offsets[0]
+    trains = [offsets, -offsets] if both_directions else [offsets]
+
+    lines = InfluenceLines(beam)
+    sf, bm, reactions, leads = [], [], [], []
+    for d in trains:
+        lead = np.linspace(-d.max(), beam.length - d.min(), num_positions)
+        axle_pos = lead[:, None] + d[None, :]
+        on_beam = (axle_pos >= 0) & (axle_pos <= beam.length)
+        load = np.where(on_beam, weights[None, :], 0.0)
+        flat = np.clip(axle_pos, 0, beam.length).ravel()
+        unit = lines.reactions(flat)
+        shear, moment = lines.section_responses(sections, flat, unit)
+        forces = unit[0]
+        n = len(sections)
+        sf.append(np.einsum('mpk,pk->mp', shear.reshape(n, num_positions, -1), load))
+        bm.append(np.einsum('mpk,pk->mp', moment.reshape(n, num_positions, -1), load))
+        reactions.append(np.einsum('spk,pk->sp', forces.reshape(len(forces), num_positions, -1), load))
+        leads.append(lead)
+    return MovingLoadEnvelope(sections, np.concatenate(leads), np.concatenate(sf, axis=1),
+                              np.concatenate(bm, axis=1), np.concatenate(reactions, axis=1))
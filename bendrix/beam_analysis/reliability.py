@@ -0,0 +1,267 @@
+import copy
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+import numpy as np
+from .batch import BeamBatch
+from .diagrams import singularity_terms
+from ..instrument import instrumented
+from ..loads.loads import LoadSet
+
+# Samples drawn from one child seed. The samples depend only on the seed and
+# the number of samples; the number of workers does not change the results,
+# and the memory budget only the last bits of matrix products
+BLOCK_SIZE = 65536
+POSITION_FIELDS = ('position', 'start', 'end')
+# Reactions of these do not depend on EI
+STATICALLY_DETERMINATE = ('simply_supported', 'overhanging', 'cantilever')
+
+
+class Normal:
+    def __init__(self, mean, std):
+        self.mean = mean
+        self.std = std
+
+    def sample(self, rng, size):
+        return rng.normal(self.mean, self.std, size)
+
+
+class LogNormal:
+    """Lognormal variable with the given mean and standard deviation (not of its log)."""
+
+    def __init__(self, mean, std):
+        if mean <= 0:
+            raise ValueError("LogNormal mean must be positive")
+        self.mean = mean
+        self.std = std
+        self.sigma = math.sqrt(math.log1p((std / mean) ** 2))
+        self.mu = math.log(mean) - self.sigma ** 2 / 2
+
+    def sample(self, rng, size):
+        return rng.lognormal(self.mu, self.sigma, size)
+
+
+class Uniform:
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def sample(self, rng, size):
+        return rng.uniform(self.low, self.high, size)
+
+
+class Gumbel:
+    """Gumbel (extreme value type I) variable with the given mean and standard deviation.
+
+    The usual model for maximum live, wind and snow loads.
+    """
+
+    def __init__(self, mean, std):
+        self.mean = mean
+        self.std = std
+        self.scale = std * math.sqrt(6) / math.pi
+        self.loc = mean - 0.5772156649015329 * self.scale
+
+    def sample(self, rng, size):
+        return rng.gumbel(self.loc, self.scale, size)
+
+
+class MonteCarlo:
+    """Monte Carlo simulation of a beam whose load parameters are random.
+
+    The beam supplies the length, supports and nominal loads; vary()
+    gives individual load parameters a distribution, e.g.
+    mc.vary(live, magnitude=Gumbel(12.0, 3.0), position=Uniform(500, 3500)).
+    Values are in the load's internal units (N, mm, N/mm, N*mm). A
+    distribution is any object with sample(rng, size). The batched solve
+    assumes a constant EI, so statically indeterminate beams with a
+    stepped flexural rigidity are rejected.
+    """
+
+    def __init__(self, beam):
+        beam.check_supports()
+        rigidity = beam.flexural_rigidity
+        if (beam.beam_type not in STATICALLY_DETERMINATE and rigidity is not None
+                and len(np.unique(rigidity[1])) > 1):
+            raise ValueError("Monte Carlo analysis of indeterminate beams needs a uniform flexural rigidity")
+        self.beam = beam
+        self.variations = []
+
+    def vary(self, load, **distributions):
+        if not any(existing is load for existing in self.beam.loads):
+            raise ValueError("Load is not on this beam")
+        if isinstance(load, LoadSet):
+            raise ValueError("Loads in a LoadSet cannot be varied; add them as separate loads")
+        unknown = set(distributions) - set(load.state_fields())
+        if unknown:
+            raise ValueError(f"Unknown load parameter(s): {', '.join(sorted(unknown))}")
+        for entry in self.variations:
+            if entry[0] is load:
+                entry[1].update(distributions)
+                return self
+        self.variations.append((load, dict(distributions)))
+        return self
+
+    def _model(self, num_points):
+        # Everything a worker needs, as a picklable tuple
+        beam = self.beam
+        varied = [load for load, _ in self.variations]
+        fixed = [load for load in beam.loads if not any(load is v for v in varied)]
+        supports = sorted(beam.supports, key=lambda s: s.position)
+        # The statically determinate solvers treat every support as a pin
+        pinned = beam.beam_type in ('simply_supported', 'overhanging')
+        layout = [(s.position, 'pinned' if pinned else s.type) for s in supports]
+        return beam.length, layout, singularity_terms(fixed), self.variations, num_points
+
+    @instrumented('reliability')
+    def run(self, samples, seed=None, num_points=201, memory_mb=256, workers=1):
+        """Simulate `samples` beams and return a ReliabilityResult.
+
+        Samples are drawn in blocks of BLOCK_SIZE, each from its own child
+        of np.random.SeedSequence(seed), and evaluated in chunks sized to
+        keep the working arrays within memory_mb. Peak SF and BM come
+        from num_points even positions plus both sides of every load and
+        support. workers > 1 spreads blocks over processes (None: all
+        cores) without changing the results. A different memory_mb
+        changes the chunks BLAS multiplies, so results can differ in
+        round-off only.
+        """
+        if samples < 1:
+            raise ValueError("samples must be at least 1")
+        model = self._model(num_points)
+        sizes = [min(BLOCK_SIZE, samples - start) for start in range(0, samples, BLOCK_SIZE)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        jobs = [(model, s, n, memory_mb) for s, n in zip(seeds, sizes)]
+        if workers == 1 or len(jobs) == 1:
+            blocks = list(map(_simulate_block, jobs))
+        else:
+            with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+                blocks = list(pool.map(_simulate_block, jobs))
+        columns = [np.concatenate(parts) for parts in zip(*blocks)]
+        return ReliabilityResult([p for p, _ in model[1]], *columns)
+
+
+def _draw(model, rng, n):
+    """Return coefficients and positions (n, T) and orders (T,) of all loads for n samples."""
+    length, _, (coef, pos, orders), variations, _ = model
+    coefs, positions = [np.broadcast_to(coef, (n, len(orders)))], [np.broadcast_to(pos, (n, len(orders)))]
+    orders = [orders]
+    for load, distributions in variations:
+        # The load methods work elementwise, so a copy holding sample arrays
+        # gives the singularity terms of every sample at once
+        sample = copy.copy(load)
+        for name, distribution in distributions.items():
+            values = distribution.sample(rng, n) if hasattr(distribution, 'sample') else distribution
+            if name in POSITION_FIELDS:
+                values = np.clip(values, 0.0, length)
+            object.__setattr__(sample, name, values)
+        c, p, o = sample.get_singularity_terms()
+        coefs.append(np.column_stack([np.broadcast_to(v, (n,)) for v in c]))
+        positions.append(np.column_stack([np.broadcast_to(v, (n,)) for v in p]))
+        orders.append(o)
+    return np.column_stack(coefs), np.column_stack(positions), np.concatenate(orders).astype(int)
+
+
+def _peaks(model, coef, pos, orders):
+    length, layout, _, _, num_points = model
+    batch = BeamBatch(np.full(len(coef), float(length)))
+    for position, kind in layout:
+        batch.add_support(position, kind)
+    batch.add_terms(coef, pos, orders)
+    forces, moments = batch.calculate_reactions()
+    # The even grid is shared by all samples, which evaluate_at exploits;
+    # loads and supports sit exactly on a jump, so both sides of each are added
+    sf, bm = batch.evaluate_at(np.linspace(0.0, length, num_points), (forces, moments))
+    events = np.column_stack((pos, batch.support_positions))
+    events = np.clip(np.column_stack((events, np.nextafter(events, -np.inf))), 0.0, length)
+    sf_events, bm_events = batch.evaluate_at(events, (forces, moments))
+    return (np.maximum(bm.max(axis=1), bm_events.max(axis=1)), np.minimum(bm.min(axis=1), bm_events.min(axis=1)),
+            np.maximum(sf.max(axis=1), sf_events.max(axis=1)), np.minimum(sf.min(axis=1), sf_events.min(axis=1)),
+            forces, moments)
+
+
+def _chunk_size(model, terms, memory_mb):
+    # Evaluation keeps about ten (chunk, positions) arrays alive, the
+    # reaction solve three (chunk, dofs, dofs) matrices
+    _, layout, _, _, num_points = model
+    positions = num_points + 2 * (terms + len(layout))
+    dofs = 2 * (len(layout) + 2)
+    per_sample = 8 * (10 * positions + 3 * dofs ** 2 + 4 * terms)
+    return max(1, int(memory_mb * 2 ** 20 // per_sample))
+
+
+def _simulate_block(job):
+    model, seed, n, memory_mb = job
+    coef, pos, orders = _draw(model, np.random.default_rng(seed), n)
+    chunk = _chunk_size(model, len(orders), memory_mb)
+    parts = [_peaks(model, coef[start:start + chunk], pos[start:start + chunk], orders)
+             for start in range(0, n, chunk)]
+    return [np.concatenate(column) for column in zip(*parts)]
+
+
+class ReliabilityResult:
+    """Per-sample peak SF/BM and reactions from MonteCarlo.run.
+
+    max_moment/min_moment and max_shear/min_shear are the signed extremes
+    of each sample (N*mm, N); forces and moments are (samples, supports)
+    reactions in support position order.
+    """
+
+    def __init__(self, support_positions, max_moment, min_moment, max_shear, min_shear, forces, moments):
+        self.support_positions = support_positions
+        self.max_moment = max_moment
+        self.min_moment = min_moment
+        self.max_shear = max_shear
+        self.min_shear = min_shear
+        self.forces = forces
+        self.moments = moments
+
+    def __len__(self):
+        return len(self.max_moment)
+
+    @property
+    def peak_moment(self):
+        return np.maximum(np.abs(self.max_moment), np.abs(self.min_moment))
+
+    @property
+    def peak_shear(self):
+        return np.maximum(np.abs(self.max_shear), np.abs(self.min_shear))
+
+    def values(self, quantity):
+        """Samples of 'moment' or 'shear' (peak absolute values), an attribute
+        name such as 'max_moment', or 'reaction_<i>' for support i's force."""
+        if quantity in ('moment', 'shear'):
+            return getattr(self, f"peak_{quantity}")
+        if quantity.startswith('reaction_'):
+            return self.forces[:, int(quantity[len('reaction_'):])]
+        if quantity in ('max_moment', 'min_moment', 'max_shear', 'min_shear'):
+            return getattr(self, quantity)
+        raise ValueError(f"Unknown quantity: {quantity}")
+
+    def exceedance_probability(self, capacity, quantity='moment'):
+        """Fraction of samples whose quantity exceeds capacity.
+
+        capacity may be a scalar or one value per sample, e.g. a random
+        resistance drawn with the same distributions.
+        """
+        return float(np.mean(self.values(quantity) > capacity))
+
+    def percentiles(self, q=(5, 50, 95, 99), quantity='moment'):
+        return dict(zip(q, np.percentile(self.values(quantity), q).tolist()))
+
+    def summary(self, moment_capacity=None, shear_capacity=None, q=(5, 50, 95, 99)):
+        """Percentiles of peak moment, peak shear and each reaction force, plus
+        exceedance probability, its standard error and the reliability index
+        beta for every capacity given."""
+        n = len(self)
+        out = {'samples': n, 'percentiles': {name: self.percentiles(q, name) for name in
+                                             ['moment', 'shear'] + [f"reaction_{i}" for i in range(self.forces.shape[1])]}}
+        for name, capacity in (('moment', moment_capacity), ('shear', shear_capacity)):
+            if capacity is None:
+                continue
+            p = self.exceedance_probability(capacity, name)
+            beta = -NormalDist().inv_cdf(p) if 0 < p < 1 else (math.inf if p == 0 else -math.inf)
+            out[f"{name}_exceedance"] = {'probability': p, 'standard_error': math.sqrt(p * (1 - p) / n),
+                                         'reliability_index': beta}
+        return out
@@ -0,0 +1,197 @@
+import numpy as np
+from .diagrams import breakpoints_for, distributed_intensity
+
+# Gauss-Legendre points on [0, 1]; three points integrate the cubic shape
+# functions times a linear load intensity exactly.
+GAUSS_POINTS = 0.5 + 0.5 * np.array([-np.sqrt(0.6), 0.0, np.sqrt(0.6)])
+GAUSS_WEIGHTS = np.array([5.0, 8.0, 5.0]) / 18.0
+
+# (row, column) pairs of the upper triangle of a 4x4 element matrix
+_UPPER = [(a, b) for a in range(4) for b in range(a, 4)]
+
+
+def element_stiffness(h, ei):
+    """Stiffness matrices of Euler-Bernoulli beam elements, shape (..., 4, 4).
+
+    DOFs per element are (v1, theta1, v2, theta2) with v up and theta
+    counterclockwise.
+    """
+    h = np.asarray(h, dtype=float)
+    ei = np.broadcast_to(np.asarray(ei, dtype=float), h.shape)
+    one = np.ones_like(h)
+    h2 = h * h
+    k = np.stack([
+        np.stack([12 * one, 6 * h, -12 * one, 6 * h], axis=-1),
+        np.stack([6 * h, 4 * h2, -6 * h, 2 * h2], axis=-1),
+        np.stack([-12 * one, -6 * h, 12 * one, -6 * h], axis=-1),
+        np.stack([6 * h, 2 * h2, -6 * h, 4 * h2], axis=-1),
+    ], axis=-2)
+    return k * (ei / h ** 3)[..., None, None]
+
+
+def snap_round_off(values, ulps=16):
+    """Remove solver round-off from reactions.
+
+    Values within `ulps` units in the last place (of the largest value) of a
+    12-significant-digit number become that number, e.g. 5999.999999999999
+    becomes 6000.0, and round-off around zero becomes 0.0.
+    """
+    values = np.asarray(values, dtype=float)
+    if not values.size:
+        return values
+    tolerance = ulps * np.spacing(np.abs(values).max())
+    clean = np.array([float(f"{v:.12g}") for v in values])
+    values = np.where(np.abs(clean - values) <= tolerance, clean, values)
+    return np.where(np.abs(values) <= tolerance, 0.0, values)
+
+
+def hermite_shape(xi, h):
+    """Cubic Hermite shape functions at local coordinate xi in [0, 1]."""
+    xi2 = xi * xi
+    xi3 = xi2 * xi
+    return np.stack([1 - 3 * xi2 + 2 * xi3, h * (xi - 2 * xi2 + xi3),
+                     3 * xi2 - 2 * xi3, h * (xi3 - xi2)], axis=-1)
+
+
+def hermite_slope(xi, h):
+    """Derivatives d/dx of the Hermite shape functions."""
+    xi2 = xi * xi
+    return np.stack([(6 * xi2 - 6 * xi) / h, 1 - 4 * xi + 3 * xi2,
+                     (6 * xi - 6 * xi2) / h, 3 * xi2 - 2 * xi], axis=-1)
+
+
+class BeamStiffness:
+    """Direct-stiffness model of a beam on any set of supports.
+
+    Nodes sit at both beam ends, at every support and wherever a piecewise
+    (breakpoints, values) flexural rigidity changes; each pair of adjacent
+    nodes is one beam element. The global matrix is assembled in banded form
+    and factorized once, so solving costs O(number of nodes) per load case.
+    """
+
+    def __init__(self, length, supports, flexural_rigidity=1.0):
+        self.length = length
+        self.support_positions = np.array([s.position for s in supports], dtype=float)
+        self.support_types = [s.type for s in supports]
+        if len(np.unique(self.support_positions)) != len(self.support_positions):
+            raise ValueError("Supports must be at distinct positions")
+        self.nodes = np.unique(np.concatenate(([0.0, float(length)], self.support_positions)))
+        ei = flexural_rigidity
+        if isinstance(flexural_rigidity, tuple):
+            # Piecewise-constant EI: add a free node wherever EI changes
+            ei_breaks, ei_values = flexural_rigidity
+            self.nodes = breakpoints_for(length, np.concatenate((self.nodes, ei_breaks)))
+            mid = 0.5 * (self.nodes[:-1] + self.nodes[1:])
+            ei = ei_values[np.clip(np.searchsorted(ei_breaks, mid, side='right') - 1, 0, len(ei_values) - 1)]
+        self.lengths = np.diff(self.nodes)
+        self.ndof = 2 * len(self.nodes)
+        self.k = element_stiffness(self.lengths, ei)
+
+        support_nodes = np.searchsorted(self.nodes, self.support_positions)
+        self.force_dofs = 2 * support_nodes
+        self.moment_dofs = np.array([2 * n + 1 for n, t in zip(support_nodes, self.support_types) if t == 'fixed'], dtype=int)
+        self.fixed_mask = np.array([t == 'fixed' for t in self.support_types], dtype=bool)
+        self.restrained = np.concatenate((self.force_dofs, self.moment_dofs)).astype(int)
+        self._factor = self._factorize()
+
+    def _factorize(self):
+        ab = np.zeros((4, self.ndof))
+        first = 2 * np.arange(len(self.lengths))
+        for a, b in _UPPER:
+            np.add.at(ab, (3 + a - b, first + b), self.k[:, a, b])
+        # Zero displacement at restrained DOFs: clear row and column, unit diagonal
+        for r in self.restrained:
+            ab[:3, r] = 0.0
+            for off in range(1, 4):
+                if r + off < self.ndof:
+                    ab[3 - off, r + off] = 0.0
+            ab[3, r] = 1.0
+        # SciPy is only needed once a statically indeterminate beam is solved
+        from scipy.linalg import cholesky_banded
+        try:
+            return cholesky_banded(ab, lower=False)
+        except np.linalg.LinAlgError:
+            raise ValueError("Supports do not restrain the beam against rigid-body motion")
+
+    def element_of(self, positions):
+        idx = np.searchsorted(self.nodes, positions, side='right') - 1
+        return np.clip(idx, 0, len(self.lengths) - 1)
+
+    def nodal_loads(self, terms):
+        """Equivalent nodal load vector (fixed-end actions) of singularity terms."""
+        coef, pos, order = (np.asarray(t) for t in terms)
+        f = np.zeros((len(self.lengths), 4))
+
+        # Point forces and couples act through the shape functions directly
+        for wanted, shape in ((0, hermite_shape), (-1, hermite_slope)):
+            pick = order == wanted
+            if not np.any(pick):
+                continue
+            e = self.element_of(pos[pick])
+            xi = (pos[pick] - self.nodes[e]) / self.lengths[e]
+            # Couples are clockwise positive; rotations are counterclockwise
+            sign = 1.0 if wanted == 0 else -1.0
+            np.add.at(f, e, sign * coef[pick][:, None] * shape(xi, self.lengths[e]))
+
+        # Distributed load: Gauss quadrature on each piece of linear intensity
+        if np.any(order > 0):
+            cuts = np.concatenate((self.nodes, pos[order > 0]))
+            q = distributed_intensity(breakpoints_for(self.length, cuts), (coef, pos, order))
+            start = q.breakpoints[:-1]
+            span = np.diff(q.breakpoints)
+            e = self.element_of(start)
+            x = start[:, None] + span[:, None] * GAUSS_POINTS
+            intensity = q.coefficients[:, :1] + q.coefficients[:, 1:] * (x - start[:, None])
+            xi = (x - self.nodes[e][:, None]) / self.lengths[e][:, None]
+            shape = hermite_shape(xi, self.lengths[e][:, None])
+            weights = (intensity * GAUSS_WEIGHTS * span[:, None])[..., None]
+            np.add.at(f, e, np.sum(weights * shape, axis=1))
+
+        load = np.zeros(self.ndof)
+        first = 2 * np.arange(len(self.lengths))
+        for a in range(4):
+            np.add.at(load, first + a, f[:, a])
+        return load
+
+    def unit_point_loads(self, positions):
+        """Nodal load matrix (ndof, n) for a unit downward force at each position."""
+        positions = np.asarray(positions, dtype=float)
+        e = self.element_of(positions)
+        xi = (positions - self.nodes[e]) / self.lengths[e]
+        shape = hermite_shape(xi, self.lengths[e])
+        load = np.zeros((self.ndof, len(positions)))
+        cols = np.arange(len(positions))
+        for a in range(4):
+            np.add.at(load, (2 * e + a, cols), -shape[:, a])
+        return load
+
+    def solve_nodal(self, load):
+        """Solve for nodal displacements and the support reaction vector.
+
+        load may hold several load cases as columns. Returns the displacements
+        and K @ u - load, which is non-zero only at restrained DOFs.
+        """
+        load = np.asarray(load, dtype=float)
+        rhs = load.copy()
+        rhs[self.restrained] = 0.0
+        from scipy.linalg import cho_solve_banded
+        u = cho_solve_banded((self._factor, False), rhs)
+        first = 2 * np.arange(len(self.lengths))
+        dofs = first[:, None] + np.arange(4)
+        internal = np.einsum('eab,eb...->ea...', self.k, u[dofs])
+        residual = -load
+        for a in range(4):
+            np.add.at(residual, first + a, internal[:, a])
+        return u, residual
+
+    def reactions_from_residual(self, residual):
+        forces = residual[self.force_dofs]
+        moments = np.zeros_like(forces)
+        # Report couples clockwise-positive like MomentLoad
+        moments[self.fixed_mask] = -residual[self.moment_dofs]
+        return forces, moments
+
+    def solve(self, terms):
+        """Return (reaction forces, reaction moments) in support order."""
+        _, residual = self.solve_nodal(self.nodal_loads(terms))
+        return self.reactions_from_residual(residual)
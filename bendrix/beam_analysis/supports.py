@@ -5,4 +5,8 @@ class Support:
         self.position = UnitConversion.convert(position, position_unit, 'mm')
         self.type = type
         self.reaction_force = 0.0  # N, positive up
-        self.reaction_moment = 0.0 if type != 'fixed' else 0.0  # N*mm
\ No newline at end of file
+        self.reaction_moment = 0.0 if type != 'fixed' else 0.0  # N*mm, clockwise couple on the beam
+
+    def get_state(self):
+        # Reaction values are results, not inputs, so they are left out
+        return (self.position, self.type)
@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from .file_io.model_files import beam_from_dict, read_models, find_model_files
+
+
+def analyze_model(model, out_dir, num_points=200, plots=False):
+    """Analyze one model dictionary and write its results to out_dir."""
+    name = model['name']
+    beam = beam_from_dict(model)
+    beam.calculate_reactions()
+    reactions = [{
+        'position': s.position,
+        'type': s.type,
+        'force': s.reaction_force,
+        'moment': s.reaction_moment,
+    } for s in beam.supports]
+    with open(os.path.join(out_dir, f"{name}_reactions.json"), 'w') as f:
+        json.dump({'name': name, 'beam_type': beam.beam_type, 'length': beam.length,
+                   'reactions': reactions}, f, indent=2)
+    beam.export_sf_bm_to_csv(os.path.join(out_dir, f"{name}_sf_bm.csv"), num_points=num_points)
+    if plots:
+        # Imported here so runs without --plots never load matplotlib
+        from .plotting.renderer import shared_renderer
+        shared_renderer(num_points).save(beam, os.path.join(out_dir, f"{name}_sf_bm.png"))
+    return name
+
+
+def analyze_file(job):
+    """Analyze every model in one file; never raises.
+
+    Returns a list of (path, model name, error message or None) so one bad
+    model does not stop the rest of the run.
+    """
+    path, out_dir, num_points, plots = job
+    try:
+        models = read_models(path)
+    except Exception as e:
+        return [(path, None, f"{type(e).__name__}: {e}")]
+    results = []
+    for model in models:
+        try:
+            results.append((path, analyze_model(model, out_dir, num_points, plots), None))
+        except Exception as e:
+            results.append((path, model.get('name'), f"{type(e).__name__}: {e}"))
+    return results
+
+
+def run_models(paths, out_dir, workers=None, num_points=200, plots=False, chunksize=None):
+    """Analyze all model files under paths, spreading files over worker processes.
+
+    workers=1 runs in the current process. Returns the per-model results of
+    analyze_file, in file order.
+    """
+    files = find_model_files(paths)
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(path, out_dir, num_points, plots) for path in files]
+    if workers == 1 or len(jobs) <= 1:
+        batches = map(analyze_file, jobs)
+    else:
+        workers = workers or os.cpu_count() or 1
+        if chunksize is None:
+            # A few chunks per worker keeps IPC low while balancing uneven files
+            chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(analyze_file, jobs, chunksize=chunksize))
+    return [result for batch in batches for result in batch]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='bendrix', description='Beam analysis from model files')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='analyze JSON/CSV beam model files')
+    run.add_argument('paths', nargs='+', help='model files or directories containing them')
+    run.add_argument('-o', '--output', default='results', help='output directory (default: results)')
+    run.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: all cores)')
+    run.add_argument('-n', '--points', type=int, default=200, help='SF/BM sample points per beam')
+    run.add_argument('--plots', action='store_true', help='also save SF/BM diagram PNGs')
+    run.add_argument('--chunksize', type=int, default=None, help='files handed to a worker at a time')
+    serve = commands.add_parser('serve', help='answer analysis requests over a local socket (JSON lines)')
+    serve.add_argument('--socket', help='listen on this Unix socket path instead of TCP')
+    serve.add_argument('--host', default='127.0.0.1', help='TCP host (default: 127.0.0.1)')
+    serve.add_argument('--port', type=int, default=8765, help='TCP port (default: 8765, 0 picks a free one)')
+    serve.add_argument('-w', '--workers', type=int, default=None,
+                       help='worker processes (default: all cores, 0 analyzes in the server process)')
+    serve.add_argument('--max-batch', type=int, default=256, help='most requests analyzed as one batch')
+    serve.add_argument('--max-delay', type=float, default=0.0,
+                       help='milliseconds to hold a batch open for more requests (default: 0)')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == 'run':
+        results = run_models(args.paths, args.output, args.workers, args.points, args.plots, args.chunksize)
+        failures = [r for r in results if r[2] is not None]
+        for path, name, error in failures:
+            print(f"FAILED {path}" + (f" [{name}]" if name else "") + f": {error}", file=sys.stderr)
+        print(f"{len(results) - len(failures)} of {len(results)} models analyzed, results in {args.output}")
+        return 1 if failures else 0
+    if args.command == 'serve':
+        # Imported here so `bendrix run` never loads asyncio
+        from .server import serve
+        serve(args.socket, args.host, args.port, args.workers, args.max_batch, args.max_delay / 1000)
+    return 0
@@ -0,0 +1,95 @@
+import base64
+import json
+import socket
+import numpy as np
+from .server import DEFAULT_PORT
+
+
+class Client:
+    """Blocking client for a `bendrix serve` instance.
+
+    Client(path='/tmp/bendrix.sock') connects to a Unix socket,
+    Client(host='127.0.0.1', port=8765) over TCP. Responses to analyze
+    requests are dictionaries with the model name, reactions (list of
+    position, type, force, moment) and x, sf, bm as NumPy arrays.
+    Arrays travel base64-encoded unless binary=False.
+    """
+
+    def __init__(self, path=None, host='127.0.0.1', port=DEFAULT_PORT, timeout=None, binary=True):
+        self.encoding = 'base64' if binary else 'list'
+        if path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host, port), timeout=timeout)
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile('rb')
+        self.next_id = 0
+        self.unclaimed = {}
+
+    def _send(self, message):
+        self.next_id += 1
+        message = dict(message, id=self.next_id)
+        self.sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        return self.next_id
+
+    def _receive(self, request_id):
+        # Responses may come back out of order; keep the others until asked for
+        while request_id not in self.unclaimed:
+            line = self.reader.readline()
+            if not line:
+                raise ConnectionError("Server closed the connection")
+            response = json.loads(line)
+            self.unclaimed[response.get('id')] = response
+        response = self.unclaimed.pop(request_id)
+        binary = response.get('encoding') == 'base64'
+        for key in ('x', 'sf', 'bm'):
+            if key in response:
+                values = response[key]
+                response[key] = np.frombuffer(base64.b64decode(values), '<f8') if binary else np.array(values)
+        return response
+
+    def request(self, message):
+        """Send one protocol message and return its raw response."""
+        return self._receive(self._send(message))
+
+    def ping(self):
+        return self.request({'op': 'ping'}).get('ok', False)
+
+    def stats(self):
+        """Server counters: requests, batches, errors, max_batch, connections, workers."""
+        return self.request({'op': 'stats'})
+
+    def analyze(self, model, points=200):
+        """Analyze one model dictionary (model file format); raises ValueError on failure."""
+        response = self.request({'model': model, 'points': points, 'encoding': self.encoding})
+        if 'error' in response:
+            raise ValueError(response['error'])
+        return response
+
+    def analyze_many(self, models, points=200, window=256):
+        """Analyze models with up to `window` requests in flight; returns responses in order.
+
+        Failed models give a response with an 'error' message instead of
+        raising, so one bad model does not lose the others.
+        """
+        models = list(models)
+        ids, responses = [], []
+        for model in models:
+            ids.append(self._send({'model': model, 'points': points, 'encoding': self.encoding}))
+            if len(ids) - len(responses) >= window:
+                responses.append(self._receive(ids[len(responses)]))
+        while len(responses) < len(ids):
+            responses.append(self._receive(ids[len(responses)]))
+        return responses
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
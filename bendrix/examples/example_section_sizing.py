@@ -0,0 +1,40 @@
+import os
+import sys
+
+# Ensure project root (parent of the 'bendrix' package) is on sys.path when executed directly
+if __name__ == '__main__':
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+
+import numpy as np
+from bendrix.beam_analysis.beam import Beam
+from bendrix.beam_analysis.supports import Support
+from bendrix.loads.loads import PointLoad, UniformDistributedLoad
+from bendrix.sections.sections import SectionCatalog, size_beams
+
+
+def main():
+    # Generic welded I sections: every combination of depth, width and plate thicknesses
+    depths, widths = np.arange(200, 901, 50), np.arange(100, 401, 25)
+    webs, flanges = np.array([6, 8, 10, 12]), np.array([10, 12, 15, 20, 25])
+    h, b, tw, tf = (a.ravel() for a in np.meshgrid(depths, widths, webs, flanges))
+    catalog = SectionCatalog.i_sections(h, b, tw, tf)
+
+    beams = []
+    for length in (4000, 6000, 8000):
+        beam = Beam(length=length, beam_type='simply_supported')
+        beam.add_support(Support(position=0, type='pinned'))
+        beam.add_support(Support(position=length, type='roller'))
+        beam.add_load(UniformDistributedLoad(magnitude=15, magnitude_unit='kN/m', start=0, end=length))
+        beam.add_load(PointLoad(magnitude=40, magnitude_unit='kN', position=length / 2))
+        beams.append(beam)
+
+    result = size_beams(beams, catalog, span_ratio=360, yield_strength=355)
+    print(f"Lightest of {len(catalog)} sections (S355, span/360):")
+    for beam, name, mass, util in zip(beams, result.names, result.mass, result.moment_utilization):
+        print(f"{beam.length:6.0f} mm: {name} ({mass:.1f} kg/m, bending utilization {util:.2f})")
+
+
+if __name__ == '__main__':
+    main()
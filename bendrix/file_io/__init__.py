@@ -0,0 +1 @@
+# Subpackage initializer for file_io
\ No newline at end of file
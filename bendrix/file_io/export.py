@@ -0,0 +1,243 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+import numpy as np
+from ..instrument import count, enabled
+
+CSV_HEADER = ('Position (mm)', 'Shear Force (N)', 'Bending Moment (N*mm)')
+COLUMNS = ('x', 'sf', 'bm')
+DEFAULT_CHUNK_SIZE = 65536
+
+# Bundle layout: 8-byte magic, little-endian uint64 offset of the JSON index,
+# then float64 rows of (x, sf, bm) for every beam back to back, then the index.
+BUNDLE_MAGIC = b'BDXBNDL1'
+BUNDLE_DATA_OFFSET = 16
+
+
+def iter_samples(beam, num_points=200, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield (x, sf, bm) chunks of beam's samples at np.linspace(0, length, num_points).
+
+    Only one chunk is held at a time, so exports of any resolution run in
+    bounded memory. The positions match np.linspace exactly. Samples that
+    fit in one chunk are the beam's cached get_samples arrays, shared with
+    plots.
+    """
+    if num_points < 2:
+        raise ValueError("num_points must be at least 2")
+    if num_points <= chunk_size:
+        yield beam.get_samples(num_points)
+        return
+    step = beam.length / (num_points - 1)
+    for start in range(0, num_points, chunk_size):
+        stop = min(start + chunk_size, num_points)
+        x = np.arange(start, stop) * step
+        if stop == num_points:
+            x[-1] = beam.length
+        sf, bm = beam.evaluate(x)
+        yield x, sf, bm
+
+
+def _ensure_parent(path):
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+
+class CsvSampleWriter:
+    """Streaming CSV writer; each chunk is formatted with a single % operation."""
+
+    def __init__(self, path, num_points, float_format='%.12g', header=True, line_terminator='\n'):
+        _ensure_parent(path)
+        self.file = open(path, 'w', newline='')
+        self.row_format = ','.join([float_format] * 3) + line_terminator
+        if header:
+            self.file.write(','.join(CSV_HEADER) + line_terminator)
+
+    def write(self, x, sf, bm):
+        rows = np.column_stack((x, sf, bm))
+        self.file.write((self.row_format * len(rows)) % tuple(rows.ravel().tolist()))
+
+    def close(self):
+        self.file.close()
+
+
+class NpySampleWriter:
+    """Writes an (num_points, 3) float64 .npy file through a memory map.
+
+    The result opens zero-copy with np.load(path, mmap_mode='r').
+    """
+
+    def __init__(self, path, num_points):
+        _ensure_parent(path)
+        self.array = np.lib.format.open_memmap(path, mode='w+', dtype='<f8', shape=(num_points, 3))
+        self.row = 0
+
+    def write(self, x, sf, bm):
+        stop = self.row + len(x)
+        self.array[self.row:stop, 0] = x
+        self.array[self.row:stop, 1] = sf
+        self.array[self.row:stop, 2] = bm
+        self.row = stop
+
+    def close(self):
+        self.array.flush()
+        del self.array
+
+
+class NpzSampleWriter:
+    """Writes x, sf and bm arrays into a .npz archive.
+
+    Columns are spooled to temporary .npy files so that memory stays bounded,
+    then stored in the archive (deflated when compress is set).
+    """
+
+    def __init__(self, path, num_points, compress=False):
+        _ensure_parent(path)
+        self.path = path
+        self.compress = compress
+        self.tmpdir = tempfile.mkdtemp(prefix='bendrix-npz-')
+        self.columns = [np.lib.format.open_memmap(os.path.join(self.tmpdir, f"{name}.npy"), mode='w+',
+                                                  dtype='<f8', shape=(num_points,)) for name in COLUMNS]
+        self.row = 0
+
+    def write(self, x, sf, bm):
+        stop = self.row + len(x)
+        for column, values in zip(self.columns, (x, sf, bm)):
+            column[self.row:stop] = values
+        self.row = stop
+
+    def close(self):
+        try:
+            for column in self.columns:
+                column.flush()
+            self.columns = None
+            mode = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+            with zipfile.ZipFile(self.path, 'w', compression=mode, allowZip64=True) as archive:
+                for name in COLUMNS:
+                    archive.write(os.path.join(self.tmpdir, f"{name}.npy"), arcname=f"{name}.npy")
+        finally:
+            shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+WRITERS = {
+    'csv': CsvSampleWriter,
+    'npy': NpySampleWriter,
+    'npz': NpzSampleWriter,
+}
+
+
+def export_samples(beam, path, num_points=200, fmt=None, chunk_size=DEFAULT_CHUNK_SIZE, **options):
+    """Stream beam's SF/BM samples to path in one of the WRITERS formats.
+
+    fmt defaults to the file extension. Extra options go to the writer,
+    e.g. float_format='%.6f' for CSV or compress=True for npz.
+    """
+    fmt = (fmt or os.path.splitext(path)[1][1:]).lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    writer = WRITERS[fmt](path, num_points, **options)
+    try:
+        for chunk in iter_samples(beam, num_points, chunk_size):
+            writer.write(*chunk)
+    finally:
+        writer.close()
+    if enabled():
+        count('bytes_written', os.path.getsize(path))
+    return path
+
+
+class BundleWriter:
+    """Streams the samples of many beams into one memory-mappable file.
+
+    Rows of every beam are appended to a single float64 (rows, 3) block; a
+    JSON index written at the end records each beam's name, row offset and
+    row count. Use as a context manager or call close().
+    """
+
+    def __init__(self, path):
+        _ensure_parent(path)
+        self.path = path
+        self.file = open(path, 'wb')
+        self.file.write(BUNDLE_MAGIC + struct.pack('<Q', 0))
+        self.entries = []
+        self.rows = 0
+
+    def add(self, name, beam, num_points=200, chunk_size=DEFAULT_CHUNK_SIZE):
+        if any(e['name'] == name for e in self.entries):
+            raise ValueError(f"Duplicate beam name in bundle: {name}")
+        for x, sf, bm in iter_samples(beam, num_points, chunk_size):
+            self.file.write(np.column_stack((x, sf, bm)).astype('<f8', copy=False).tobytes())
+        self.entries.append({'name': name, 'offset': self.rows, 'count': num_points,
+                             'length': beam.length, 'beam_type': beam.beam_type})
+        self.rows += num_points
+
+    def close(self):
+        index_offset = self.file.tell()
+        index = {'columns': list(COLUMNS), 'dtype': '<f8', 'data_offset': BUNDLE_DATA_OFFSET,
+                 'rows': self.rows, 'beams': self.entries}
+        self.file.write(json.dumps(index).encode('utf-8'))
+        count('bytes_written', self.file.tell())
+        self.file.seek(len(BUNDLE_MAGIC))
+        self.file.write(struct.pack('<Q', index_offset))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_bundle(beams, path, names=None, num_points=200, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write all beams into one bundle file; names default to beam_<index>."""
+    beams = list(beams)
+    names = list(names) if names is not None else [f"beam_{i}" for i in range(len(beams))]
+    with BundleWriter(path) as bundle:
+        for name, beam in zip(names, beams):
+            bundle.add(name, beam, num_points, chunk_size)
+    return path
+
+
+class Bundle:
+    """Read-only view of a bundle file; samples are memory-mapped, not loaded.
+
+    bundle[name] returns the (x, sf, bm) column views of one beam.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            magic = f.read(len(BUNDLE_MAGIC))
+            if magic != BUNDLE_MAGIC:
+                raise ValueError(f"Not a bendrix bundle: {path}")
+            index_offset, = struct.unpack('<Q', f.read(8))
+            f.seek(index_offset)
+            self.index = json.loads(f.read().decode('utf-8'))
+        self.entries = {e['name']: e for e in self.index['beams']}
+        rows = self.index['rows']
+        self.data = np.memmap(path, dtype=self.index['dtype'], mode='r', offset=self.index['data_offset'],
+                              shape=(rows, len(self.index['columns']))) if rows else np.empty((0, 3))
+
+    @property
+    def names(self):
+        return [e['name'] for e in self.index['beams']]
+
+    def samples(self, name):
+        """Return the (count, 3) block of rows for one beam."""
+        try:
+            entry = self.entries[name]
+        except KeyError:
+            raise ValueError(f"No beam named {name} in bundle")
+        return self.data[entry['offset']:entry['offset'] + entry['count']]
+
+    def __getitem__(self, name):
+        rows = self.samples(name)
+        return rows[:, 0], rows[:, 1], rows[:, 2]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __iter__(self):
+        return iter(self.names)
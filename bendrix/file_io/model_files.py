@@ -0,0 +1,102 @@
+import csv
+import json
+import os
+from ..beam_analysis.beam import Beam
+from ..beam_analysis.supports import Support
+from ..loads.loads import PointLoad, UniformDistributedLoad, UniformVaryingLoad, MomentLoad
+
+# Load kinds accepted in model files; remaining fields are passed to the
+# class constructor unchanged (e.g. magnitude, position, magnitude_unit).
+LOAD_KINDS = {
+    'point': PointLoad,
+    'udl': UniformDistributedLoad,
+    'uvl': UniformVaryingLoad,
+    'moment': MomentLoad,
+}
+
+MODEL_EXTENSIONS = ('.json', '.csv')
+
+
+def beam_from_dict(model):
+    """Build a Beam from a model dictionary.
+
+    Expected keys: length, beam_type, optional length_unit, a list of
+    supports (Support keyword arguments) and a list of loads, each with a
+    'kind' from LOAD_KINDS, an optional 'case' name and the load class's
+    keyword arguments.
+    """
+    try:
+        beam = Beam(model['length'], model['beam_type'], model.get('length_unit', 'mm'))
+    except KeyError as e:
+        raise ValueError(f"Model is missing required field {e}")
+    for support in model.get('supports', []):
+        beam.add_support(Support(**support))
+    for load in model.get('loads', []):
+        load = dict(load)
+        kind = load.pop('kind', None)
+        if kind not in LOAD_KINDS:
+            raise ValueError(f"Unknown load kind: {kind}")
+        case = load.pop('case', 'default')
+        beam.add_load(LOAD_KINDS[kind](**load), case=case)
+    return beam
+
+
+def _cell(value):
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def read_csv_model(path):
+    """Read a model from CSV: one row per record, columns named after arguments.
+
+    The 'record' column is 'beam', 'support' or a load kind; every non-empty
+    cell in the row becomes a keyword argument of that record.
+    """
+    model = {'supports': [], 'loads': []}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            fields = {k.strip(): _cell(v.strip()) for k, v in row.items() if k and v and v.strip()}
+            record = fields.pop('record', None)
+            if record == 'beam':
+                model.update(fields)
+            elif record == 'support':
+                model['supports'].append(fields)
+            elif record in LOAD_KINDS:
+                fields['kind'] = record
+                model['loads'].append(fields)
+            else:
+                raise ValueError(f"Unknown record type in {path}: {record}")
+    return [model]
+
+
+def read_models(path):
+    """Return the list of model dictionaries stored in a .json or .csv file.
+
+    A JSON file holds either one model object or a list of them. Models
+    without a 'name' are named after the file (with an index if several).
+    """
+    if path.lower().endswith('.csv'):
+        models = read_csv_model(path)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+        models = data if isinstance(data, list) else [data]
+    stem = os.path.splitext(os.path.basename(path))[0]
+    for i, model in enumerate(models):
+        model.setdefault('name', stem if len(models) == 1 else f"{stem}_{i}")
+    return models
+
+
+def find_model_files(paths):
+    """Expand files and directories into a sorted list of model files."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(MODEL_EXTENSIONS):
+                    found.append(os.path.join(path, name))
+        else:
+            found.append(path)
+    return found
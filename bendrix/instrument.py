@@ -0,0 +1,192 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# The recorder that instrumented code reports to, or None when disabled.
+# Instrumented functions check this one global and otherwise run untouched.
+_active = None
+
+
+class Recorder:
+    """Per-phase wall time, call counts and counters, aggregated over many beams.
+
+    Phase times are inclusive: a phase that runs inside another (reactions
+    inside sampling, say) is counted in both. With trace=True every phase
+    call is also kept as an event for write_chrome_trace.
+    """
+
+    def __init__(self, trace=False):
+        self.trace = trace
+        self.phases = {}
+        self.counters = {}
+        self.events = []
+        self.origin = time.perf_counter_ns()
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add_phase(self, name, start, elapsed):
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = [0, 0, 0]
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+        if self.trace:
+            self.events.append((name, start, elapsed, os.getpid(), threading.get_ident()))
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        self.phases.clear()
+        self.counters.clear()
+        self.events.clear()
+        self.origin = time.perf_counter_ns()
+
+    def summary(self):
+        """Return {'phases': {name: {calls, seconds, max_seconds}}, 'counters': {...}}."""
+        return {
+            'phases': {name: {'calls': calls, 'seconds': total / 1e9, 'max_seconds': peak / 1e9}
+                       for name, (calls, total, peak) in self.phases.items()},
+            'counters': dict(self.counters),
+        }
+
+    def report(self):
+        """Summary as a plain-text table, slowest phase first."""
+        lines = [f"{'phase':24s} {'calls':>8s} {'total s':>10s} {'mean ms':>10s} {'max ms':>10s}"]
+        for name, (calls, total, peak) in sorted(self.phases.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:24s} {calls:8d} {total / 1e9:10.4f} {total / calls / 1e6:10.3f} {peak / 1e6:10.3f}")
+        for name, value in sorted(self.counters.items()):
+            lines.append(f"{name:24s} {value:>8}")
+        return '\n'.join(lines)
+
+    def write_chrome_trace(self, path):
+        """Write recorded events as Chrome trace JSON (chrome://tracing, Perfetto)."""
+        events = [{'name': name, 'ph': 'X', 'ts': (start - self.origin) / 1e3, 'dur': elapsed / 1e3,
+                   'pid': pid, 'tid': tid, 'cat': 'bendrix'}
+                  for name, start, elapsed, pid, tid in self.events]
+        end = max((e['ts'] + e['dur'] for e in events), default=0.0)
+        events += [{'name': name, 'ph': 'C', 'ts': end, 'pid': os.getpid(), 'args': {name: value}}
+                   for name, value in self.counters.items()]
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        return path
+
+
+class _Phase:
+    __slots__ = ('recorder', 'name', 'start')
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.add_phase(self.name, self.start, time.perf_counter_ns() - self.start)
+
+
+# Shared by every Beam(..., instrument=True) in this process
+_process_recorder = Recorder()
+
+
+def get_recorder():
+    """Return the process-wide recorder used by beams created with instrument=True."""
+    return _process_recorder
+
+
+# Tracing recorders for Beam(..., instrument='trace.json'), one per path
+_trace_recorders = {}
+
+
+def recorder_for(instrument):
+    """Resolve a Beam's `instrument` argument to a Recorder, or None when off.
+
+    True means the process-wide recorder and a Recorder is used as is. A path
+    gets a tracing recorder, shared by every beam given the same path, whose
+    Chrome trace is written there when the interpreter exits.
+    """
+    if isinstance(instrument, Recorder):
+        return instrument
+    if isinstance(instrument, (str, os.PathLike)):
+        path = os.path.abspath(os.fspath(instrument))
+        recorder = _trace_recorders.get(path)
+        if recorder is None:
+            recorder = _trace_recorders[path] = Recorder(trace=True)
+            atexit.register(recorder.write_chrome_trace, path)
+        return recorder
+    return _process_recorder if instrument else None
+
+
+def _owner_recorder(owner):
+    recorder = getattr(owner, 'instrument', None)
+    if not recorder:
+        return None
+    return recorder if isinstance(recorder, Recorder) else _process_recorder
+
+
+@contextmanager
+def recording(recorder=None, trace=False):
+    """Record everything instrumented inside the block, for all beams.
+
+    Yields the Recorder (a new one unless given); the previous state is
+    restored on exit, so blocks can be nested.
+    """
+    global _active
+    previous = _active
+    _active = recorder if recorder is not None else Recorder(trace=trace)
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+def enabled():
+    """True inside a recording() block or an instrumented Beam call."""
+    return _active is not None
+
+
+def count(name, n=1, owner=None):
+    """Add n to a counter if recording is enabled or owner (a Beam) is instrumented."""
+    recorder = _active
+    if recorder is None and owner is not None:
+        recorder = _owner_recorder(owner)
+    if recorder is not None:
+        recorder.count(name, n)
+
+
+def instrumented(name):
+    """Decorator recording each call of a function or method as phase `name`.
+
+    Calls are recorded when a recording() block is active, or for methods of
+    objects whose `instrument` attribute is set (Beam(instrument=...)), which
+    report to that recorder, or the process-wide one for True. Otherwise the
+    only cost is one global lookup.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            global _active
+            recorder = _active
+            if recorder is None:
+                if not (args and getattr(args[0], 'instrument', None)):
+                    return func(*args, **kwargs)
+                recorder = _owner_recorder(args[0])
+                # Route nested phases and counters to the beam's recorder too
+                _active = recorder
+                try:
+                    with recorder.phase(name):
+                        return func(*args, **kwargs)
+                finally:
+                    _active = None
+            with recorder.phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
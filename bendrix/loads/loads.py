@@ -1,7 +1,66 @@
+import operator
 from abc import ABC, abstractmethod
+import numpy as np
 from ..utils.unit_conversion import UnitConversion
 
+
+def _as_result(x, values):
+    # Scalar positions keep returning plain floats; arrays come back as arrays
+    if np.ndim(x) == 0:
+        return float(values)
+    return values
+
+# Every Load counts the assignments made to it in _version, so a Beam can
+# tell which of its loads changed without fingerprinting each of them.
+# Constructors assign through _init instead: a new load starts at version 0
+_init = object.__setattr__
+
+
+_get_version = operator.attrgetter('_version')
+
+
+def load_versions(loads):
+    """Per-load counts of attribute assignments since construction, for caching."""
+    try:
+        return tuple(map(_get_version, loads))
+    except AttributeError:
+        # A custom load that has never been assigned to has no version yet
+        return tuple([getattr(load, '_version', 0) for load in loads])
+
+
+# Fingerprinting runs on every cached Beam access, so slot values are read
+# through one operator.attrgetter per class instead of a per-call MRO walk
+_slot_getters = {}
+
+
+def _state_names(cls):
+    # Slots starting with an underscore (the version) are bookkeeping, not parameters
+    return sorted(name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ())
+                  if not name.startswith('_'))
+
+
+def _slot_getter(cls):
+    names = _state_names(cls)
+    if not names:
+        return lambda load: ()
+    getter = operator.attrgetter(*names)
+    return getter if len(names) > 1 else (lambda load: (getter(load),))
+
+
+def _prefix_sums(keys, x, *columns):
+    """For each x, the sum of every column over the entries with key <= x."""
+    order = np.argsort(keys, kind='stable')
+    index = np.searchsorted(keys[order], x, side='right')
+    return [np.concatenate(([0.0], np.cumsum(column[order])))[index] for column in columns]
+
+
 class Load(ABC):
+    __slots__ = ('_version',)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_version', getattr(self, '_version', 0) + 1)
+
     @abstractmethod
     def get_total_force(self):
         pass
@@ -18,11 +77,42 @@ class Load(ABC):
     def get_cumulative_moment_up_to(self, x):
         pass
 
+    def get_singularity_terms(self):
+        """Return (coefficients, positions, orders) of the load's shear terms.
+
+        The shear contribution is sum(c * <x - a>**n / n!) over the terms, with
+        upward forces positive. Order 0 is a point force, 1 a step and 2 a ramp
+        in distributed load, and -1 a clockwise couple (bending moment only).
+        Custom Load subclasses override this to take part in the analysis;
+        without it they can still be created but not analyzed.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement get_singularity_terms(), "
+                                  "which Beam needs to analyze it")
+
+    def get_state(self):
+        """Hashable snapshot of the load's current parameters, for caching."""
+        cls = type(self)
+        getter = _slot_getters.get(cls)
+        if getter is None:
+            getter = _slot_getters[cls] = _slot_getter(cls)
+        state = (cls.__name__, getter(self))
+        # Subclasses without __slots__ keep their attributes in __dict__
+        if hasattr(self, '__dict__'):
+            state += tuple(sorted(vars(self).items()))
+        return state
+
+    def state_fields(self):
+        """Names of the parameters that make up get_state (the slots)."""
+        return _state_names(type(self))
+
 class PointLoad(Load):
+    __slots__ = ('magnitude', 'position', 'cw_angle_to_left')
+
     def __init__(self, magnitude, position, cw_angle_to_left=0, magnitude_unit='N', position_unit='mm'):
-        self.magnitude = UnitConversion.convert(magnitude, magnitude_unit, 'N')  # Positive down
-        self.position = UnitConversion.convert(position, position_unit, 'mm')
-        self.cw_angle_to_left = cw_angle_to_left  # Assume vertical for now
+        _init(self, '_version', 0)
+        _init(self, 'magnitude', UnitConversion.convert(magnitude, magnitude_unit, 'N'))  # Positive down
+        _init(self, 'position', UnitConversion.convert(position, position_unit, 'mm'))
+        _init(self, 'cw_angle_to_left', cw_angle_to_left)  # Assume vertical for now
 
     def get_total_force(self):
         return self.magnitude
@@ -32,16 +122,23 @@ class PointLoad(Load):
         return self.magnitude * distance  # Positive clockwise
 
     def get_cumulative_force_up_to(self, x):
-        return self.magnitude if x >= self.position else 0.0
+        x = np.asarray(x, dtype=float)
+        return _as_result(x, np.where(x >= self.position, self.magnitude, 0.0))
 
     def get_cumulative_moment_up_to(self, x):
-        return 0.0
+        return _as_result(x, np.zeros(np.shape(x)))
+
+    def get_singularity_terms(self):
+        return [-self.magnitude], [self.position], [0]
 
 class UniformDistributedLoad(Load):
+    __slots__ = ('magnitude', 'start', 'end')
+
     def __init__(self, magnitude, start, end, magnitude_unit='N/mm', start_unit='mm', end_unit='mm'):
-        self.magnitude = UnitConversion.convert(magnitude, magnitude_unit, 'N/mm')
-        self.start = UnitConversion.convert(start, start_unit, 'mm')
-        self.end = UnitConversion.convert(end, end_unit, 'mm')
+        _init(self, '_version', 0)
+        _init(self, 'magnitude', UnitConversion.convert(magnitude, magnitude_unit, 'N/mm'))
+        _init(self, 'start', UnitConversion.convert(start, start_unit, 'mm'))
+        _init(self, 'end', UnitConversion.convert(end, end_unit, 'mm'))
 
     def get_total_force(self):
         return self.magnitude * (self.end - self.start)
@@ -52,22 +149,25 @@ class UniformDistributedLoad(Load):
         return self.get_total_force() * distance
 
     def get_cumulative_force_up_to(self, x):
-        if x <= self.start:
-            return 0.0
-        elif x >= self.end:
-            return self.magnitude * (self.end - self.start)
-        else:
-            return self.magnitude * (x - self.start)
+        x = np.asarray(x, dtype=float)
+        covered = np.clip(x - self.start, 0.0, self.end - self.start)
+        return _as_result(x, self.magnitude * covered)
 
     def get_cumulative_moment_up_to(self, x):
-        return 0.0
+        return _as_result(x, np.zeros(np.shape(x)))
+
+    def get_singularity_terms(self):
+        return [-self.magnitude, self.magnitude], [self.start, self.end], [1, 1]
 
 class UniformVaryingLoad(Load):
+    __slots__ = ('start_magnitude', 'end_magnitude', 'start', 'end')
+
     def __init__(self, start_magnitude, end_magnitude, start, end, mag_unit='N/mm', start_unit='mm', end_unit='mm'):
-        self.start_magnitude = UnitConversion.convert(start_magnitude, mag_unit, 'N/mm')
-        self.end_magnitude = UnitConversion.convert(end_magnitude, mag_unit, 'N/mm')
-        self.start = UnitConversion.convert(start, start_unit, 'mm')
-        self.end = UnitConversion.convert(end, end_unit, 'mm')
+        _init(self, '_version', 0)
+        _init(self, 'start_magnitude', UnitConversion.convert(start_magnitude, mag_unit, 'N/mm'))
+        _init(self, 'end_magnitude', UnitConversion.convert(end_magnitude, mag_unit, 'N/mm'))
+        _init(self, 'start', UnitConversion.convert(start, start_unit, 'mm'))
+        _init(self, 'end', UnitConversion.convert(end, end_unit, 'mm'))
 
     def get_total_force(self):
         avg = (self.start_magnitude + self.end_magnitude) / 2
@@ -84,20 +184,27 @@ class UniformVaryingLoad(Load):
         return self.get_total_force() * distance
 
     def get_cumulative_force_up_to(self, x):
-        if x <= self.start:
-            return 0.0
+        x = np.asarray(x, dtype=float)
         length = self.end - self.start
         slope = (self.end_magnitude - self.start_magnitude) / length
-        pos = min(x, self.end) - self.start
-        return self.start_magnitude * pos + 0.5 * slope * pos ** 2
+        pos = np.clip(x - self.start, 0.0, length)
+        return _as_result(x, self.start_magnitude * pos + 0.5 * slope * pos ** 2)
 
     def get_cumulative_moment_up_to(self, x):
-        return 0.0
+        return _as_result(x, np.zeros(np.shape(x)))
+
+    def get_singularity_terms(self):
+        slope = (self.end_magnitude - self.start_magnitude) / (self.end - self.start)
+        coefficients = [-self.start_magnitude, -slope, self.end_magnitude, slope]
+        return coefficients, [self.start, self.start, self.end, self.end], [1, 2, 1, 2]
 
 class MomentLoad(Load):
+    __slots__ = ('magnitude', 'position')
+
     def __init__(self, magnitude, position, magnitude_unit='N*mm', position_unit='mm'):
-        self.magnitude = UnitConversion.convert(magnitude, magnitude_unit, 'N*mm')
-        self.position = UnitConversion.convert(position, position_unit, 'mm')
+        _init(self, '_version', 0)
+        _init(self, 'magnitude', UnitConversion.convert(magnitude, magnitude_unit, 'N*mm'))
+        _init(self, 'position', UnitConversion.convert(position, position_unit, 'mm'))
 
     def get_total_force(self):
         return 0.0
@@ -106,7 +213,163 @@ class MomentLoad(Load):
         return self.magnitude
 
     def get_cumulative_force_up_to(self, x):
-        return 0.0
+        return _as_result(x, np.zeros(np.shape(x)))
+
+    def get_cumulative_moment_up_to(self, x):
+        x = np.asarray(x, dtype=float)
+        return _as_result(x, np.where(x >= self.position, self.magnitude, 0.0))
+
+    def get_singularity_terms(self):
+        return [self.magnitude], [self.position], [-1]
+
+
+class LoadSet(Load):
+    """Many loads stored column-wise, one read-only NumPy array per field.
+
+    Loads of each kind ('point', 'udl', 'uvl', 'moment', as in model files)
+    are added in bulk from arrays and act on a beam as a single Load, so
+    tens of thousands of loads cost a few arrays instead of one object each.
+    Columns are replaced, never modified in place, and every change bumps a
+    version number that stands in for the contents in get_state.
+    """
+    __slots__ = ('columns', 'version')
+
+    FIELDS = {
+        'point': ('magnitude', 'position'),
+        'udl': ('magnitude', 'start', 'end'),
+        'uvl': ('start_magnitude', 'end_magnitude', 'start', 'end'),
+        'moment': ('magnitude', 'position'),
+    }
+
+    def __init__(self):
+        _init(self, '_version', 0)
+        _init(self, 'columns', {kind: {field: np.zeros(0) for field in fields}
+                                for kind, fields in self.FIELDS.items()})
+        _init(self, 'version', 0)
+
+    def _extend(self, kind, values, units=None):
+        """Append columns for kind; units pairs each column with (from, to) units.
+
+        Converted values are written straight into the merged column, so
+        each input table is read once and never modified.
+        """
+        values = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float)) for v in values))
+        if any(v.ndim != 1 for v in values):
+            raise ValueError("Load arrays must be one-dimensional")
+        columns = self.columns[kind]
+        units = units or [(None, None)] * len(values)
+        for field, new, (from_unit, to_unit) in zip(self.FIELDS[kind], values, units):
+            old = columns[field]
+            merged = np.empty(len(old) + len(new))
+            merged[:len(old)] = old
+            np.multiply(new, UnitConversion.factor(from_unit, to_unit), out=merged[len(old):])
+            merged.flags.writeable = False
+            columns[field] = merged
+        self.version += 1
+        return self
+
+    def add_point_loads(self, magnitudes, positions, magnitude_unit='N', position_unit='mm'):
+        return self._extend('point', (magnitudes, positions), [(magnitude_unit, 'N'), (position_unit, 'mm')])
+
+    def add_udls(self, magnitudes, starts, ends, magnitude_unit='N/mm', start_unit='mm', end_unit='mm'):
+        return self._extend('udl', (magnitudes, starts, ends),
+                            [(magnitude_unit, 'N/mm'), (start_unit, 'mm'), (end_unit, 'mm')])
+
+    def add_uvls(self, start_magnitudes, end_magnitudes, starts, ends, mag_unit='N/mm', start_unit='mm', end_unit='mm'):
+        return self._extend('uvl', (start_magnitudes, end_magnitudes, starts, ends),
+                            [(mag_unit, 'N/mm'), (mag_unit, 'N/mm'), (start_unit, 'mm'), (end_unit, 'mm')])
+
+    def add_moment_loads(self, magnitudes, positions, magnitude_unit='N*mm', position_unit='mm'):
+        return self._extend('moment', (magnitudes, positions), [(magnitude_unit, 'N*mm'), (position_unit, 'mm')])
+
+    @classmethod
+    def from_loads(cls, loads):
+        """Pack individual PointLoad/UDL/UVL/MomentLoad objects into a LoadSet."""
+        kinds = {PointLoad: 'point', UniformDistributedLoad: 'udl', UniformVaryingLoad: 'uvl', MomentLoad: 'moment'}
+        groups = {kind: [] for kind in cls.FIELDS}
+        for load in loads:
+            if type(load) not in kinds:
+                raise ValueError(f"LoadSet cannot hold {type(load).__name__}")
+            groups[kinds[type(load)]].append(load)
+        load_set = cls()
+        for kind, group in groups.items():
+            if group:
+                load_set._extend(kind, [[getattr(l, f) for l in group] for f in cls.FIELDS[kind]])
+        return load_set
+
+    def to_loads(self):
+        """Return the loads as individual Load objects."""
+        loads = [PointLoad(m, p) for m, p in zip(*self._fields('point'))]
+        loads += [UniformDistributedLoad(w, a, b) for w, a, b in zip(*self._fields('udl'))]
+        loads += [UniformVaryingLoad(q0, q1, a, b) for q0, q1, a, b in zip(*self._fields('uvl'))]
+        loads += [MomentLoad(m, p) for m, p in zip(*self._fields('moment'))]
+        return loads
+
+    def _fields(self, kind):
+        return [self.columns[kind][field] for field in self.FIELDS[kind]]
+
+    def count(self, kind=None):
+        """Number of loads, of one kind or in total."""
+        kinds = [kind] if kind else self.FIELDS
+        return sum(len(self.columns[k][self.FIELDS[k][0]]) for k in kinds)
+
+    def __len__(self):
+        return self.count()
+
+    def get_total_force(self):
+        m, _ = self._fields('point')
+        w, a, b = self._fields('udl')
+        q0, q1, c, d = self._fields('uvl')
+        return float(m.sum() + (w * (b - a)).sum() + (0.5 * (q0 + q1) * (d - c)).sum())
+
+    def get_moment_about(self, ref_point):
+        m, p = self._fields('point')
+        w, a, b = self._fields('udl')
+        q0, q1, c, d = self._fields('uvl')
+        mm, _ = self._fields('moment')
+        span = d - c
+        # Trapezoid moment about its start is span**2 * (q0/6 + q1/3)
+        uvl = span ** 2 * (q0 / 6 + q1 / 3) + 0.5 * (q0 + q1) * span * (c - ref_point)
+        return float((m * (p - ref_point)).sum() + (w * (b - a) * (0.5 * (a + b) - ref_point)).sum()
+                     + uvl.sum() + mm.sum())
+
+    def get_cumulative_force_up_to(self, x):
+        # Each load is a polynomial in x from its start on, minus the same
+        # polynomial less the load's total from its end on; sorted prefix
+        # sums add them up without a (positions x loads) array
+        x = np.asarray(x, dtype=float)
+        m, p = self._fields('point')
+        w, a, b = self._fields('udl')
+        q0, q1, c, d = self._fields('uvl')
+        half_slope = 0.5 * (q1 - q0) / (d - c)
+        constant, linear = c * (half_slope * c - q0), q0 - 2 * half_slope * c
+        uvl_total = 0.5 * (q0 + q1) * (d - c)
+        points, = _prefix_sums(p, x, m)
+        udl_on, udl_off = _prefix_sums(a, x, w, w * a), _prefix_sums(b, x, w, w * b)
+        uvl_on = _prefix_sums(c, x, constant, linear, half_slope)
+        uvl_off = _prefix_sums(d, x, constant - uvl_total, linear, half_slope)
+        total = points + x * (udl_on[0] - udl_off[0]) - (udl_on[1] - udl_off[1])
+        total = total + (uvl_on[0] - uvl_off[0]) + x * ((uvl_on[1] - uvl_off[1]) + x * (uvl_on[2] - uvl_off[2]))
+        return _as_result(x, total)
 
     def get_cumulative_moment_up_to(self, x):
-        return self.magnitude if x >= self.position else 0.0
\ No newline at end of file
+        x = np.asarray(x, dtype=float)
+        mm, p = self._fields('moment')
+        return _as_result(x, _prefix_sums(p, x, mm)[0])
+
+    def get_singularity_terms(self):
+        m, p = self._fields('point')
+        w, a, b = self._fields('udl')
+        q0, q1, c, d = self._fields('uvl')
+        mm, pm = self._fields('moment')
+        slope = (q1 - q0) / (d - c)
+        coefficients = np.concatenate((-m, -w, w, -q0, -slope, q1, slope, mm))
+        positions = np.concatenate((p, a, b, c, c, d, d, pm))
+        orders = np.repeat([0, 1, 1, 1, 2, 1, 2, -1], [len(m), len(w), len(w), len(q0), len(q0),
+                                                       len(q0), len(q0), len(mm)])
+        return coefficients, positions, orders
+
+    def get_state(self):
+        # Columns are immutable between versions, so identity and version
+        # describe the contents without hashing every array
+        return (type(self).__name__, id(self), self.version)
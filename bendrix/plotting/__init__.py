@@ -0,0 +1 @@
+# Subpackage initializer for plotting
\ No newline at end of file
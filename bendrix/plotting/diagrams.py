@@ -0,0 +1,62 @@
+import os
+from ..instrument import count, enabled
+
+
+def _new_figure(show):
+    # Figures that are only saved never touch pyplot, so no GUI backend is
+    # selected or imported; pyplot is loaded only when a window is wanted.
+    if show:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=(10, 8))
+    from matplotlib.figure import Figure
+    return Figure(figsize=(10, 8))
+
+
+def diagram_path(beam, save_path):
+    """Resolve save_path (a directory or a file path) to the output file."""
+    if os.path.isdir(save_path) or save_path.endswith(os.sep):
+        # If a directory is given, construct a default filename
+        os.makedirs(save_path, exist_ok=True)
+        safe_name = (beam.beam_type or 'beam').replace(' ', '_')
+        return os.path.join(save_path, f"{safe_name}_sf_bm.png")
+    # treat as file path (ensure parent dir exists)
+    parent = os.path.dirname(save_path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    return save_path
+
+
+def plot_beam_diagrams(beam, num_points=200, save_path=None, show=True):
+    """Plot shear force and bending moment diagrams of a Beam.
+
+    See Beam.plot_diagrams. Returns the matplotlib Figure.
+    """
+    x, sf, bm = beam.get_samples(num_points)
+    fig = _new_figure(show)
+    ax1, ax2 = fig.subplots(2, 1)
+    ax1.plot(x, sf, label='Shear Force')
+    # include beam type in titles
+    beam_title = (beam.beam_type or '').replace('_', ' ').title()
+    ax1.set_title(f"{beam_title} — Shear Force Diagram")
+    ax1.set_xlabel('Position (mm)')
+    ax1.set_ylabel('SF (N)')
+    ax1.grid(True)
+    ax2.plot(x, bm, label='Bending Moment')
+    ax2.set_title(f"{beam_title} — Bending Moment Diagram")
+    ax2.set_xlabel('Position (mm)')
+    ax2.set_ylabel('BM (N*mm)')
+    ax2.grid(True)
+    fig.tight_layout()
+
+    if save_path:
+        out_file = diagram_path(beam, save_path)
+        fig.savefig(out_file)
+        if enabled():
+            count('bytes_written', os.path.getsize(out_file))
+        if not show:
+            return fig
+    if show:
+        import matplotlib.pyplot as plt
+        if not save_path:
+            plt.show()
+    return fig
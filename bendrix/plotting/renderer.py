@@ -0,0 +1,212 @@
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ..instrument import instrumented, count, enabled
+
+# Matplotlib is imported lazily so that importing this module stays cheap;
+# everything renders on the Agg canvas without going through pyplot.
+
+_SVG_ID = re.compile(r'(\bid="|url\(#|href="#)([^")]+)')
+_SVG_ROOT = re.compile(r'<svg\b[^>]*\bviewBox="([^"]+)"[^>]*>(.*)</svg>', re.S)
+
+# The layout is computed once against these placeholders. Matplotlib switches
+# to offset or scientific tick labels beyond 1e6, so +-800000 gives about the
+# widest labels a diagram has; update() lays out again for anything wider.
+_LAYOUT_TITLE = 'Propped Cantilever'  # longest beam type
+_LAYOUT_LENGTH = 10000.0              # mm
+_LAYOUT_VALUE = 800000.0              # N or N*mm
+
+
+def _limits(values, margin=0.05):
+    low, high = float(np.min(values)), float(np.max(values))
+    if high - low <= 1e-12 * max(1.0, abs(low), abs(high)):
+        pad = max(1.0, abs(high))
+    else:
+        pad = margin * (high - low)
+    return low - pad, high + pad
+
+
+def _label_width(ax):
+    """Characters in the widest y tick label at the axes' current limits."""
+    axis = ax.yaxis
+    labels = axis.get_major_formatter().format_ticks(axis.get_major_locator()())
+    return max((len(label) for label in labels), default=0)
+
+
+class DiagramRenderer:
+    """Reusable SF/BM figure for rendering many beams headlessly.
+
+    The figure, axes, labels and layout are built once; each beam only
+    replaces the line data, titles and axis limits before the canvas is
+    written out. One renderer serves one process, so it must not be shared
+    between threads.
+    """
+
+    def __init__(self, num_points=200, figsize=(10, 8), dpi=100, compress_level=1):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        self.num_points = num_points
+        self.dpi = dpi
+        self.compress_level = compress_level
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.sf_axes, self.bm_axes = self.figure.subplots(2, 1)
+        self.sf_line, = self.sf_axes.plot([0, 1], [0, 0], label='Shear Force')
+        self.bm_line, = self.bm_axes.plot([0, 1], [0, 0], label='Bending Moment')
+        for ax, name, unit in ((self.sf_axes, 'Shear Force', 'SF (N)'), (self.bm_axes, 'Bending Moment', 'BM (N*mm)')):
+            ax.set_title(f"{_LAYOUT_TITLE} — {name} Diagram")
+            ax.set_xlabel('Position (mm)')
+            ax.set_ylabel(unit)
+            ax.grid(True)
+            ax.set_xlim(0, _LAYOUT_LENGTH)
+            ax.set_ylim(-_LAYOUT_VALUE, _LAYOUT_VALUE)
+        self.figure.tight_layout()
+        self.label_width = max(_label_width(ax) for ax in (self.sf_axes, self.bm_axes))
+
+    def update(self, beam):
+        """Draw beam's SF/BM samples into the shared figure and return it."""
+        x, sf, bm = beam.get_samples(self.num_points)
+        beam_title = (beam.beam_type or '').replace('_', ' ').title()
+        for ax, line, values, name in ((self.sf_axes, self.sf_line, sf, 'Shear Force'),
+                                       (self.bm_axes, self.bm_line, bm, 'Bending Moment')):
+            line.set_data(x, values)
+            ax.set_title(f"{beam_title} — {name} Diagram")
+            ax.set_xlim(0, beam.length)
+            ax.set_ylim(*_limits(values))
+        width = max(_label_width(ax) for ax in (self.sf_axes, self.bm_axes))
+        if width > self.label_width:
+            self.figure.tight_layout()
+            self.label_width = width
+        return self.figure
+
+    @instrumented('render')
+    def save(self, beam, path, fmt=None):
+        """Render beam to path; the format follows the file extension unless given."""
+        self.update(beam)
+        fmt = fmt or os.path.splitext(path)[1][1:].lower() or 'png'
+        if fmt == 'png':
+            self.write_png(path)
+        else:
+            self.figure.savefig(path, format=fmt)
+        if enabled():
+            count('bytes_written', os.path.getsize(path))
+        return path
+
+    def write_png(self, path):
+        # The figure is opaque, so dropping alpha and using light compression
+        # roughly halves encoding time compared with savefig's defaults
+        from PIL import Image
+        self.canvas.draw()
+        image = Image.frombuffer('RGBA', self.canvas.get_width_height(), self.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1)
+        image.convert('RGB').save(path, format='png', compress_level=self.compress_level)
+
+    def svg_symbol(self, beam, symbol_id):
+        """Return beam's diagram as an SVG <symbol> with ids prefixed by symbol_id."""
+        self.update(beam)
+        buf = io.StringIO()
+        self.figure.savefig(buf, format='svg')
+        match = _SVG_ROOT.search(buf.getvalue())
+        if match is None:
+            raise ValueError("Unexpected SVG output from matplotlib")
+        view_box, body = match.groups()
+        # Every symbol carries its own clip paths and glyphs; prefix ids so
+        # they stay unique within the combined document
+        body = _SVG_ID.sub(lambda m: f"{m.group(1)}{symbol_id}-{m.group(2)}", body)
+        return f'<symbol id="{symbol_id}" viewBox="{view_box}">{body}</symbol>'
+
+
+# One renderer per worker process, created on first use
+_renderer = None
+
+
+def shared_renderer(num_points=200, dpi=100):
+    """Return this process's DiagramRenderer, rebuilding it if settings change."""
+    global _renderer
+    if _renderer is None or (_renderer.num_points, _renderer.dpi) != (num_points, dpi):
+        _renderer = DiagramRenderer(num_points=num_points, dpi=dpi)
+    return _renderer
+
+
+def _render_files(job):
+    beams, paths, num_points, dpi = job
+    renderer = shared_renderer(num_points, dpi)
+    return [renderer.save(beam, path) for beam, path in zip(beams, paths)]
+
+
+def _render_symbols(job):
+    beams, names, num_points, dpi = job
+    renderer = shared_renderer(num_points, dpi)
+    return [renderer.svg_symbol(beam, name) for beam, name in zip(beams, names)]
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _run(func, beams, labels, num_points, dpi, workers, chunksize):
+    beams, labels = list(beams), list(labels)
+    if workers == 1 or len(beams) <= 1:
+        return func((beams, labels, num_points, dpi))
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, -(-len(beams) // (workers * 4)))
+    jobs = [(b, l, num_points, dpi) for b, l in zip(_chunks(beams, chunksize), _chunks(labels, chunksize))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [item for part in pool.map(func, jobs) for item in part]
+
+
+def _names(beams, names):
+    return list(names) if names is not None else [f"beam_{i}" for i in range(len(beams))]
+
+
+def render_diagrams(beams, out_dir, names=None, fmt='png', num_points=200, dpi=100, workers=None, chunksize=None):
+    """Render one diagram file per beam into out_dir, spread over worker processes.
+
+    Files are named <name>_sf_bm.<fmt>; names default to beam_<index>.
+    Returns the written paths in beam order.
+    """
+    beams = list(beams)
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, f"{name}_sf_bm.{fmt}") for name in _names(beams, names)]
+    return _run(_render_files, beams, paths, num_points, dpi, workers, chunksize)
+
+
+def render_pdf(beams, path, num_points=200, dpi=100):
+    """Write every beam's diagram as one page of a multi-page PDF.
+
+    A PDF stream cannot be assembled from several processes, so pages are
+    rendered here in sequence on the shared figure.
+    """
+    from matplotlib.backends.backend_pdf import PdfPages
+    renderer = shared_renderer(num_points, dpi)
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    with PdfPages(path) as pdf:
+        for beam in beams:
+            pdf.savefig(renderer.update(beam))
+    return path
+
+
+def render_svg_sprite(beams, path, names=None, num_points=200, dpi=100, workers=None, chunksize=None):
+    """Write all diagrams into one SVG file as <symbol> elements.
+
+    Each symbol's id is the beam's name (default beam_<index>) and can be
+    shown with <svg><use href="file.svg#name"/></svg>.
+    """
+    beams = list(beams)
+    symbols = _run(_render_symbols, beams, _names(beams, names), num_points, dpi, workers, chunksize)
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    with open(path, 'w') as f:
+        f.write('<?xml version="1.0" encoding="utf-8" standalone="no"?>\n')
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                'style="display:none">\n')
+        for symbol in symbols:
+            f.write(symbol)
+            f.write('\n')
+        f.write('</svg>\n')
+    return path
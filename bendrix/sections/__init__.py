@@ -0,0 +1 @@
+# Subpackage initializer for sections
@@ -0,0 +1,264 @@
+import copy
+import csv
+import numpy as np
+from ..beam_analysis.batch import BeamBatch
+from ..beam_analysis.diagrams import deflection_diagrams
+from ..utils.unit_conversion import UnitConversion
+
+# Catalog columns: attribute, CSV header name, internal unit
+COLUMNS = (
+    ('area', 'area', 'mm2'),
+    ('inertia', 'I', 'mm4'),
+    ('section_modulus', 'Zel', 'mm3'),
+    ('plastic_modulus', 'Zpl', 'mm3'),
+    ('shear_area', 'Av', 'mm2'),
+    ('mass', 'mass', 'kg/m'),
+)
+STEEL_DENSITY = 7850.0  # kg/m3
+
+# Beams x sections checked at a time by size_sections
+_CHUNK_CELLS = 4_000_000
+
+
+def _split_header(header):
+    # 'I (cm4)' -> ('I', 'cm4'); 'Zel' -> ('Zel', None)
+    header = header.strip()
+    if header.endswith(')') and '(' in header:
+        name, unit = header[:-1].split('(', 1)
+        return name.strip(), unit.strip()
+    return header, None
+
+
+class SectionCatalog:
+    """Table of prismatic sections stored as NumPy columns, in mm and kg/m.
+
+    Columns are area (mm2), inertia I (mm4), section_modulus Zel (mm3),
+    plastic_modulus Zpl (mm3), shear_area Av (mm2, the area resisting
+    shear) and mass (kg/m). Shear area defaults to the full area and mass
+    to area times density.
+    """
+
+    def __init__(self, names, area, inertia, section_modulus, plastic_modulus, shear_area=None, mass=None,
+                 density=STEEL_DENSITY):
+        self.names = [str(n) for n in names]
+        self.area = np.asarray(area, dtype=float)
+        self.inertia = np.asarray(inertia, dtype=float)
+        self.section_modulus = np.asarray(section_modulus, dtype=float)
+        self.plastic_modulus = np.asarray(plastic_modulus, dtype=float)
+        self.shear_area = self.area.copy() if shear_area is None else np.asarray(shear_area, dtype=float)
+        self.mass = self.area * 1e-6 * density if mass is None else np.asarray(mass, dtype=float)
+        sizes = {len(self.names)} | {len(getattr(self, attr)) for attr, _, _ in COLUMNS}
+        if len(sizes) != 1:
+            raise ValueError("All catalog columns must have one value per section")
+        # Lightest first; ties keep catalog order
+        self.order = np.argsort(self.mass, kind='stable')
+
+    @classmethod
+    def from_csv(cls, path, density=STEEL_DENSITY):
+        """Read a catalog with columns name, area, I, Zel, Zpl and optional Av, mass.
+
+        A unit may follow a column name in parentheses, e.g. 'I (cm4)' or
+        'mass (lb/ft)'; values are converted to the internal units. Other
+        columns are ignored.
+        """
+        with open(path, newline='') as f:
+            rows = list(csv.reader(f))
+        if not rows:
+            raise ValueError(f"Empty section catalog: {path}")
+        headers = [_split_header(h) for h in rows[0]]
+        index = {name: i for i, (name, _) in enumerate(headers)}
+        missing = [h for h in ('name', 'area', 'I', 'Zel', 'Zpl') if h not in index]
+        if missing:
+            raise ValueError(f"Section catalog {path} is missing column(s): {', '.join(missing)}")
+        body = [row for row in rows[1:] if any(cell.strip() for cell in row)]
+        values = {}
+        for attr, header, unit in COLUMNS:
+            if header in index:
+                i = index[header]
+                try:
+                    column = np.array([float(row[i]) for row in body])
+                except ValueError as e:
+                    raise ValueError(f"Bad {header} value in {path}: {e}")
+                values[attr] = UnitConversion.convert_inplace(column, headers[i][1] or unit, unit)
+        return cls([row[index['name']].strip() for row in body], density=density, **values)
+
+    @classmethod
+    def rectangles(cls, widths, depths, names=None, unit='mm', density=STEEL_DENSITY):
+        """Solid rectangles b x h bending about the axis parallel to b.
+
+        widths and depths broadcast together, so a grid of sizes is
+        rectangles(b[:, None], h[None, :]).
+        """
+        f = UnitConversion.factor(unit, 'mm')
+        b, h = (np.asarray(v, dtype=float).ravel() * f for v in np.broadcast_arrays(widths, depths))
+        area = b * h
+        names = names or [f"R{bi:g}x{hi:g}" for bi, hi in zip(b, h)]
+        return cls(names, area, b * h ** 3 / 12, b * h ** 2 / 6, b * h ** 2 / 4, area, density=density)
+
+    @classmethod
+    def circles(cls, diameters, names=None, unit='mm', density=STEEL_DENSITY):
+        """Solid round bars of the given diameters."""
+        d = np.atleast_1d(np.asarray(diameters, dtype=float)) * UnitConversion.factor(unit, 'mm')
+        area = np.pi * d ** 2 / 4
+        names = names or [f"D{di:g}" for di in d]
+        return cls(names, area, np.pi * d ** 4 / 64, np.pi * d ** 3 / 32, d ** 3 / 6, area, density=density)
+
+    @classmethod
+    def i_sections(cls, depths, widths, web_thicknesses, flange_thicknesses, names=None, unit='mm',
+                   density=STEEL_DENSITY):
+        """Doubly symmetric I sections (no root radii) bending about the strong axis.
+
+        Shear area is the full depth times the web thickness. Arguments
+        broadcast together like rectangles().
+        """
+        f = UnitConversion.factor(unit, 'mm')
+        h, b, tw, tf = (np.asarray(v, dtype=float).ravel() * f
+                        for v in np.broadcast_arrays(depths, widths, web_thicknesses, flange_thicknesses))
+        if np.any(2 * tf >= h) or np.any(tw > b):
+            raise ValueError("Flanges must be thinner than half the depth and the web narrower than the flanges")
+        hw = h - 2 * tf
+        area = 2 * b * tf + hw * tw
+        inertia = (b * h ** 3 - (b - tw) * hw ** 3) / 12
+        plastic = b * tf * (h - tf) + tw * hw ** 2 / 4
+        names = names or [f"I{hi:g}x{bi:g}x{twi:g}x{tfi:g}" for hi, bi, twi, tfi in zip(h, b, tw, tf)]
+        return cls(names, area, inertia, 2 * inertia / h, plastic, h * tw, density=density)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        """Row i as a dictionary (internal units)."""
+        row = {'name': self.names[i]}
+        row.update({attr: float(getattr(self, attr)[i]) for attr, _, _ in COLUMNS})
+        return row
+
+    def index(self, name):
+        try:
+            return self.names.index(name)
+        except ValueError:
+            raise ValueError(f"No section named {name} in catalog")
+
+
+class SizingResult:
+    """Lightest passing section per beam, from size_sections.
+
+    index holds the catalog row for each beam, or -1 where no section
+    passes (names is None and the other values nan there). The
+    utilization arrays are demand / capacity of the chosen section for
+    bending, shear and deflection (nan when that check was not made).
+    """
+
+    def __init__(self, catalog, index, moment_utilization, shear_utilization, deflection_utilization):
+        self.index = index
+        found = index >= 0
+        self.names = [catalog.names[i] if i >= 0 else None for i in index]
+        self.mass = np.where(found, catalog.mass[index], np.nan)
+        self.moment_utilization = moment_utilization
+        self.shear_utilization = shear_utilization
+        self.deflection_utilization = deflection_utilization
+
+    @property
+    def all_found(self):
+        return bool(np.all(self.index >= 0))
+
+    def __len__(self):
+        return len(self.index)
+
+
+def size_sections(catalog, moment, shear=None, ei_deflection=None, deflection_limit=None, yield_strength=355.0,
+                  shear_strength=None, youngs_modulus=210000.0, plastic=False, stress_unit='N/mm2'):
+    """Pick the lightest catalog section that passes every check, for each beam.
+
+    moment (N*mm) and shear (N) are the largest absolute values per beam,
+    scalars or arrays of shape (N,). Bending passes when moment does not
+    exceed yield_strength times Zel (Zpl with plastic=True); shear passes
+    when shear does not exceed shear_strength (default yield / sqrt(3))
+    times Av. For deflection, ei_deflection is the largest |EI * deflection|
+    (N*mm3, e.g. from beam_demands) and deflection_limit the allowed
+    deflection in mm; the check passes when ei_deflection / (E * I) is
+    within the limit. All sections are checked against all beams with
+    array comparisons, in chunks of rows for very large batches.
+    """
+    fy = UnitConversion.convert(float(yield_strength), stress_unit, 'N/mm2')
+    tau = fy / np.sqrt(3) if shear_strength is None else UnitConversion.convert(float(shear_strength), stress_unit, 'N/mm2')
+    e = UnitConversion.convert(float(youngs_modulus), stress_unit, 'N/mm2')
+    if not len(catalog):
+        raise ValueError("Section catalog is empty")
+    moment = np.abs(np.atleast_1d(np.asarray(moment, dtype=float)))
+    n = len(moment)
+
+    # Each check becomes a minimum section property per beam
+    modulus = catalog.plastic_modulus if plastic else catalog.section_modulus
+    checks = [(modulus, moment / fy)]
+    if shear is not None:
+        checks.append((catalog.shear_area, np.broadcast_to(np.abs(np.asarray(shear, dtype=float)), (n,)) / tau))
+    if ei_deflection is not None:
+        if deflection_limit is None:
+            raise ValueError("deflection_limit is required with ei_deflection")
+        limit = np.broadcast_to(np.asarray(deflection_limit, dtype=float), (n,))
+        if np.any(limit <= 0):
+            raise ValueError("deflection_limit must be positive")
+        demand = np.broadcast_to(np.abs(np.asarray(ei_deflection, dtype=float)), (n,))
+        checks.append((catalog.inertia, demand / (e * limit)))
+
+    # Columns in lightest-first order, so the first passing column is the answer
+    order = catalog.order
+    properties = [prop[order] for prop, _ in checks]
+    index = np.full(n, -1)
+    rows = max(1, _CHUNK_CELLS // max(len(catalog), 1))
+    for start in range(0, n, rows):
+        stop = min(start + rows, n)
+        passing = np.ones((stop - start, len(catalog)), dtype=bool)
+        for prop, (_, required) in zip(properties, checks):
+            passing &= prop[None, :] >= required[start:stop, None]
+        first = passing.argmax(axis=1)
+        found = passing[np.arange(stop - start), first]
+        index[start:stop] = np.where(found, order[first], -1)
+
+    def utilization(prop, required):
+        return np.where(index >= 0, required / prop[np.maximum(index, 0)], np.nan)
+    nan = np.full(n, np.nan)
+    result = [utilization(*checks[0])]
+    result.append(utilization(*checks[1]) if shear is not None else nan)
+    result.append(utilization(*checks[-1]) if ei_deflection is not None else nan)
+    return SizingResult(catalog, index, *result)
+
+
+def beam_demands(beams, num_points=1001):
+    """Return (moment, shear, ei_deflection) arrays: largest absolute values per beam.
+
+    beams is a list of Beam objects or a BeamBatch. For Beams the values
+    are exact, from the diagram polynomials; a BeamBatch is sampled at
+    num_points. ei_deflection is EI times the deflection of the same beam
+    with constant EI, which is what a prismatic section will give.
+    """
+    if isinstance(beams, BeamBatch):
+        _, sf, bm = beams.evaluate(num_points)
+        unit = copy.copy(beams)
+        unit.flexural_rigidity = np.ones(beams.size)
+        _, _, deflection = unit.deflections(num_points)
+        return np.abs(bm).max(axis=1), np.abs(sf).max(axis=1), np.abs(deflection).max(axis=1)
+    moment, shear, ei_deflection = [], [], []
+    for beam in beams:
+        extremes = beam.extremes()
+        moment.append(max(abs(extremes.max_moment), abs(extremes.min_moment)))
+        shear.append(max(abs(extremes.max_shear), abs(extremes.min_shear)))
+        _, bm = beam.get_diagrams()
+        fixed = [s.position for s in beam.supports if s.type == 'fixed']
+        _, deflection = deflection_diagrams(bm, (np.zeros(1), np.ones(1)), [s.position for s in beam.supports], fixed)
+        high, _, low, _ = deflection.piece_extrema()
+        ei_deflection.append(max(np.abs(high).max(), np.abs(low).max()))
+    return np.array(moment), np.array(shear), np.array(ei_deflection)
+
+
+def size_beams(beams, catalog, span_ratio=None, num_points=1001, **criteria):
+    """Size Beams or a BeamBatch: beam_demands followed by size_sections.
+
+    With span_ratio (e.g. 360) deflection is limited to length / span_ratio;
+    criteria are passed to size_sections (yield_strength, plastic, ...).
+    """
+    moment, shear, ei_deflection = beam_demands(beams, num_points)
+    if span_ratio is not None:
+        lengths = beams.lengths if isinstance(beams, BeamBatch) else np.array([b.length for b in beams])
+        criteria.update(ei_deflection=ei_deflection, deflection_limit=lengths / span_ratio)
+    return size_sections(catalog, moment, shear, **criteria)
@@ -0,0 +1,273 @@
+import asyncio
+import base64
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from .beam_analysis.batch import BeamBatch
+from .beam_analysis.diagrams import singularity_terms
+from .file_io.model_files import beam_from_dict
+
+# Protocol: newline-delimited JSON in both directions. A request is
+#   {"id": 7, "model": {...model file dictionary...}, "points": 200}
+# or {"id": 7, "op": "ping"} / {"id": 7, "op": "stats"}. Every response
+# carries the request's id; responses on one connection may arrive out of
+# order, so clients can pipeline many requests. With "encoding": "base64"
+# the x, sf and bm arrays are sent as base64 of little-endian float64
+# instead of JSON lists, which is far cheaper to encode and decode.
+DEFAULT_PORT = 8765
+DEFAULT_POINTS = 200
+MAX_LINE = 64 * 1024 * 1024
+# Smaller groups are faster as single Beams than as a BeamBatch
+MIN_BATCH = 3
+
+# Two-support determinate beams ignore the support types; BeamBatch does
+# not, so such beams with a fixed support are analyzed on their own
+_PINNED_ONLY = ('simply_supported', 'overhanging')
+
+
+def _error(request, error):
+    return {'id': request.get('id') if isinstance(request, dict) else None,
+            'error': f"{type(error).__name__}: {error}"}
+
+
+def _array(values, encoding):
+    if encoding == 'base64':
+        return base64.b64encode(values.astype('<f8', copy=False).tobytes()).decode('ascii')
+    return values.tolist()
+
+
+def _response(request, beam, forces, moments, x, sf, bm):
+    encoding = request.get('encoding', 'list')
+    return {
+        'id': request.get('id'),
+        'name': request['model'].get('name'),
+        'beam_type': beam.beam_type,
+        'length': beam.length,
+        'reactions': [{'position': s.position, 'type': s.type, 'force': float(f), 'moment': float(m)}
+                      for s, f, m in zip(beam.supports, forces, moments)],
+        'encoding': encoding,
+        'x': _array(x, encoding),
+        'sf': _array(sf, encoding),
+        'bm': _array(bm, encoding),
+    }
+
+
+def _analyze_single(request, beam, points):
+    beam.calculate_reactions()
+    x, sf, bm = beam.get_samples(points)
+    return _response(request, beam, [s.reaction_force for s in beam.supports],
+                     [s.reaction_moment for s in beam.supports], x, sf, bm)
+
+
+def analyze_requests(requests):
+    """Analyze a list of model requests; return the response dicts in order.
+
+    Models with the same beam type, support layout, load kinds and number
+    of points are stacked into one BeamBatch, the rest are analyzed as
+    single Beams. A failing model only fails its own response.
+    """
+    responses = [None] * len(requests)
+    groups = {}
+    for i, request in enumerate(requests):
+        try:
+            beam = beam_from_dict(request['model'])
+            beam.check_supports()
+            points = int(request.get('points', DEFAULT_POINTS))
+            if points < 2:
+                raise ValueError("points must be at least 2")
+            if request.get('encoding', 'list') not in ('list', 'base64'):
+                raise ValueError(f"Unknown encoding: {request['encoding']}")
+        except Exception as e:
+            responses[i] = _error(request, e)
+            continue
+        # Reactions are reported in position order, as the Beam solvers do
+        beam.supports.sort(key=lambda s: s.position)
+        layout = tuple(s.type for s in beam.supports)
+        key = (beam.beam_type, layout, tuple(singularity_terms(beam.loads)[2].tolist()), points)
+        groups.setdefault(key, []).append((i, beam))
+
+    for (beam_type, layout, _, points), members in groups.items():
+        if len(members) >= MIN_BATCH and not (beam_type in _PINNED_ONLY and 'fixed' in layout):
+            try:
+                batch = BeamBatch.from_beams([beam for _, beam in members])
+                forces, moments = batch.calculate_reactions()
+                x, sf, bm = batch.evaluate(points)
+            except ValueError:
+                pass
+            else:
+                for row, (i, beam) in enumerate(members):
+                    responses[i] = _response(requests[i], beam, forces[row], moments[row], x[row], sf[row], bm[row])
+                continue
+        for i, beam in members:
+            try:
+                responses[i] = _analyze_single(requests[i], beam, points)
+            except Exception as e:
+                responses[i] = _error(requests[i], e)
+    return responses
+
+
+def _encode(responses):
+    return [json.dumps(r).encode('utf-8') + b'\n' for r in responses]
+
+
+def analyze_lines(requests):
+    """Return analyze_requests' responses encoded as protocol lines, and the error count."""
+    responses = analyze_requests(requests)
+    return _encode(responses), sum('error' in r for r in responses)
+
+
+def _warm_up():
+    # Import and exercise every solver path once so the first real request is fast
+    model = {'length': 1000, 'beam_type': 'continuous', 'supports': [{'position': 0}, {'position': 1000}],
+             'loads': [{'kind': 'point', 'magnitude': 1, 'position': 500}]}
+    analyze_requests([{'model': model}] * MIN_BATCH + [{'model': dict(model, beam_type='fixed')}])
+    return os.getpid()
+
+
+class AnalysisServer:
+    """asyncio server that answers model requests from a warm worker pool.
+
+    Requests from all connections go into one queue. Whenever a worker is
+    free, everything waiting (up to max_batch) is sent to it as one batch,
+    so under load concurrent requests are coalesced into BeamBatch runs
+    while a lone request is dispatched at once. max_delay (seconds) holds
+    each batch open a little longer to gather more requests.
+    workers=0 analyzes in a thread of the server process.
+    """
+
+    def __init__(self, workers=None, max_batch=256, max_delay=0.0):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.stats = {'requests': 0, 'batches': 0, 'errors': 0, 'max_batch': 0, 'connections': 0}
+        self.pool = None
+        self.queue = None
+
+    async def start(self, path=None, host='127.0.0.1', port=DEFAULT_PORT):
+        """Start the worker pool and listen; returns the address actually bound."""
+        loop = asyncio.get_running_loop()
+        if self.workers:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=1)
+        await asyncio.gather(*[loop.run_in_executor(self.pool, _warm_up) for _ in range(max(self.workers, 1))])
+        self.queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._dispatch())
+        if path:
+            if os.path.exists(path):
+                os.unlink(path)
+            self.server = await asyncio.start_unix_server(self._handle, path, limit=MAX_LINE)
+            return f"unix:{path}"
+        self.server = await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"tcp:{host}:{port}"
+
+    async def close(self):
+        # Not wait_closed(): open client connections would keep it waiting
+        self.server.close()
+        self._batcher.cancel()
+        # Waiting for the workers to exit blocks, so it runs off the event loop
+        await asyncio.get_running_loop().run_in_executor(None, lambda: self.pool.shutdown(cancel_futures=True))
+
+    async def _handle(self, reader, writer):
+        self.stats['connections'] += 1
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self._answer(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.wait(pending)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(self, line, writer):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+        except ValueError as e:
+            self.stats['errors'] += 1
+            data = _encode([_error(None, e)])[0]
+        else:
+            op = request.get('op', 'analyze')
+            if op == 'ping':
+                data = _encode([{'id': request.get('id'), 'ok': True}])[0]
+            elif op == 'stats':
+                data = _encode([dict(self.stats, id=request.get('id'), workers=self.workers)])[0]
+            elif op == 'analyze' and 'model' in request:
+                future = asyncio.get_running_loop().create_future()
+                self.queue.put_nowait((request, future))
+                data = await future
+            else:
+                self.stats['errors'] += 1
+                data = _encode([_error(request, ValueError(f"Unknown request: op={op!r}"))])[0]
+        writer.write(data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def _dispatch(self):
+        slots = asyncio.Semaphore(max(self.workers, 1))
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(self.max_delay)
+            # Requests keep queueing while every worker is busy
+            await slots.acquire()
+            while len(batch) < self.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            asyncio.create_task(self._run(batch, slots))
+
+    async def _run(self, batch, slots):
+        requests = [request for request, _ in batch]
+        try:
+            lines, errors = await asyncio.get_running_loop().run_in_executor(self.pool, analyze_lines, requests)
+        except Exception as e:
+            lines, errors = _encode([_error(request, e) for request in requests]), len(requests)
+        finally:
+            slots.release()
+        self.stats['requests'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['errors'] += errors
+        self.stats['max_batch'] = max(self.stats['max_batch'], len(batch))
+        for (_, future), line in zip(batch, lines):
+            if not future.done():
+                future.set_result(line)
+
+
+async def _serve(path, host, port, workers, max_batch, max_delay):
+    server = AnalysisServer(workers, max_batch, max_delay)
+    address = await server.start(path, host, port)
+    print(f"bendrix serving on {address} with {server.workers} worker(s)", flush=True)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
+        if path and os.path.exists(path):
+            os.unlink(path)
+
+
+def serve(path=None, host='127.0.0.1', port=DEFAULT_PORT, workers=None, max_batch=256, max_delay=0.0):
+    """Run an AnalysisServer until SIGINT/SIGTERM; path selects a Unix socket."""
+    if path and not hasattr(asyncio, 'start_unix_server'):
+        raise ValueError("Unix sockets are not available on this platform")
+    try:
+        asyncio.run(_serve(path, host, port, workers, max_batch, max_delay))
+    except KeyboardInterrupt:
+        print("bendrix server stopped", file=sys.stderr)
@@ -9,4 +9,7 @@ setup(
         'scipy',
         'matplotlib'
     ],
+    entry_points={
+        'console_scripts': ['bendrix=bendrix.cli:main'],
+    },
 )
\ No newline at end of file
@@ -33,22 +33,123 @@ class UnitConversion:
         'ft3_to_m3': 0.0283168,
         'mm3_to_in3': 0.0000610237,
         'in3_to_mm3': 16387.1,
-        'mm4_to_in4': 3.861e-8,
-        'in4_to_mm4': 25910600000,
-        'mm4_to_ft4': 3.861e-12,
-        'ft4_to_mm4': 2591060000000,
+        'mm4_to_in4': 1/25.4**4,
+        'in4_to_mm4': 25.4**4,
+        'mm4_to_ft4': 1/304.8**4,
+        'ft4_to_mm4': 304.8**4,
         'mm4_to_m4': 1e-12,
         'm4_to_mm4': 1e12,
+        'N*m2_to_N*mm2': 1e6,
+        'N*mm2_to_N*m2': 1e-6,
+        'kN*m2_to_N*mm2': 1e9,
+        'N*mm2_to_kN*m2': 1e-9,
+        'kN*mm2_to_N*mm2': 1000,
+        'N*mm2_to_kN*mm2': 0.001,
+        'cm2_to_mm2': 100,
+        'm2_to_mm2': 1e6,
+        'in2_to_mm2': 645.16,
+        'cm3_to_mm3': 1000,
+        'm3_to_mm3': 1e9,
+        'cm4_to_mm4': 10000,
+        'GPa_to_MPa': 1000,
+        'lb/ft_to_kg/m': 1.48816,
     }
 
+    # Compound units derived from every force and length unit in the table,
+    # as (format, base unit, length exponent): e.g. kN/m, lbf*ft, kN*m2, N/mm2
+    compound_units = (
+        ('{force}/{length}', 'N/mm', -1),
+        ('{force}*{length}', 'N*mm', 1),
+        ('{force}*{length}2', 'N*mm2', 2),
+        ('{force}/{length}2', 'N/mm2', -2),
+    )
+    # Units that are the same quantity under two names
+    aliases = {'MPa': 'N/mm2', 'Pa': 'N/m2'}
+
+    _factors = None
+    _compiled_from = None
+
+    @classmethod
+    def compile(cls):
+        """Precompute the factor between every pair of units of the same dimension.
+
+        Units and direct factors come from conversion_factors, plus the
+        derived compound_units and aliases. Units connected through any
+        chain of factors form one dimension; a factor given directly in the
+        table is used as is, other pairs go through the dimension's first
+        unit. Called automatically on first use and whenever the table
+        changes size.
+        """
+        edges = {}
+
+        def link(a, b, factor):
+            edges.setdefault(a, {}).setdefault(b, factor)
+            edges.setdefault(b, {}).setdefault(a, 1 / factor)
+
+        for key, factor in cls.conversion_factors.items():
+            a, b = key.split('_to_')
+            link(a, b, factor)
+        to_n, to_mm = cls._reach(edges, 'N'), cls._reach(edges, 'mm')
+        for pattern, base, power in cls.compound_units:
+            for force, f in to_n.items():
+                for length, l in to_mm.items():
+                    unit = pattern.format(force=force, length=length)
+                    if unit != base:
+                        link(unit, base, f * l ** power)
+        for unit, same in cls.aliases.items():
+            link(unit, same, 1.0)
+
+        factors = {}
+        seen = set()
+        for root in edges:
+            if root in seen:
+                continue
+            to_root = cls._reach(edges, root)
+            seen.update(to_root)
+            for a, fa in to_root.items():
+                for b, fb in to_root.items():
+                    factors[(a, b)] = fa / fb
+        for a, targets in edges.items():
+            for b, factor in targets.items():
+                factors[(a, b)] = factor
+        cls._factors = factors
+        cls._compiled_from = len(cls.conversion_factors)
+        return factors
+
+    @staticmethod
+    def _reach(edges, start):
+        # Factor from every unit connected to start into start, by breadth-first search
+        found = {start: 1.0} if start in edges else {}
+        queue = list(found)
+        for unit in queue:
+            for other, factor in edges[unit].items():
+                if other not in found:
+                    found[other] = found[unit] / factor
+                    queue.append(other)
+        return found
+
+    @classmethod
+    def factor(cls, from_unit, to_unit):
+        """Multiplier taking values in from_unit to to_unit."""
+        if from_unit == to_unit:
+            return 1.0
+        factors = cls._factors
+        if factors is None or cls._compiled_from != len(cls.conversion_factors):
+            factors = cls.compile()
+        try:
+            return factors[(from_unit, to_unit)]
+        except KeyError:
+            raise ValueError(f"Conversion from {from_unit} to {to_unit} not supported.")
+
     @staticmethod
     def convert(value, from_unit, to_unit):
         if from_unit == to_unit:
             return value
-        key = f"{from_unit}_to_{to_unit}"
-        if key in UnitConversion.conversion_factors:
-            return value * UnitConversion.conversion_factors[key]
-        reverse_key = f"{to_unit}_to_{from_unit}"
-        if reverse_key in UnitConversion.conversion_factors:
-            return value / UnitConversion.conversion_factors[reverse_key]
-        raise ValueError(f"Conversion from {from_unit} to {to_unit} not supported.")
\ No newline at end of file
+        return value * UnitConversion.factor(from_unit, to_unit)
+
+    @staticmethod
+    def convert_inplace(values, from_unit, to_unit):
+        """Convert a float NumPy array in place and return it."""
+        if from_unit != to_unit:
+            values *= UnitConversion.factor(from_unit, to_unit)
+        return values
@@ -0,0 +1 @@
+# Test package for bendrix
\ No newline at end of file
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from bendrix.beam_analysis.batch import BeamBatch
+from bendrix.loads.loads import PointLoad, UniformDistributedLoad
+from .test_beam import SUPPORTS, make_beam, reactions
+
+
+def beams(beam_type):
+    # Same layout and load kinds, different values
+    return [make_beam(beam_type, [PointLoad(1000.0 * (i + 1), 700.0 + 900.0 * i),
+                                  UniformDistributedLoad(0.5 + i, 300.0 * i, 5000.0 - 200.0 * i)])
+            for i in range(4)]
+
+
+@pytest.mark.parametrize('beam_type', list(SUPPORTS))
+def test_batch_matches_beams(beam_type):
+    group = beams(beam_type)
+    batch = BeamBatch.from_beams(group)
+    forces, moments = batch.calculate_reactions()
+    x, sf, bm = batch.evaluate(51)
+    for i, beam in enumerate(group):
+        beam_forces, beam_moments = reactions(beam)
+        scale = np.abs(beam_forces).max()
+        np.testing.assert_allclose(forces[i], beam_forces, rtol=1e-9, atol=1e-9 * scale)
+        np.testing.assert_allclose(moments[i], beam_moments, rtol=1e-9, atol=1e-9 * scale * beam.length)
+        beam_x, beam_sf, beam_bm = beam.get_samples(51)
+        np.testing.assert_allclose(x[i], beam_x)
+        np.testing.assert_allclose(sf[i], beam_sf, rtol=1e-9, atol=1e-9 * scale)
+        np.testing.assert_allclose(bm[i], beam_bm, rtol=1e-9, atol=1e-9 * scale * beam.length)
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from bendrix.beam_analysis.beam import Beam
+from bendrix.beam_analysis.supports import Support
+from bendrix.loads.loads import PointLoad, UniformDistributedLoad, UniformVaryingLoad, MomentLoad
+
+L = 6000.0
+P, A, B = 10000.0, 2000.0, 4000.0
+W = 2.0
+
+SUPPORTS = {
+    'simply_supported': [(0, 'pinned'), (L, 'roller')],
+    'cantilever': [(0, 'fixed')],
+    'overhanging': [(0, 'pinned'), (4000.0, 'roller')],
+    'fixed': [(0, 'fixed'), (L, 'fixed')],
+    'propped_cantilever': [(0, 'fixed'), (L, 'roller')],
+    'continuous': [(0, 'pinned'), (L / 2, 'roller'), (L, 'roller')],
+}
+
+
+def make_beam(beam_type, loads=()):
+    beam = Beam(L, beam_type)
+    for position, kind in SUPPORTS[beam_type]:
+        beam.add_support(Support(position, kind))
+    for load in loads:
+        beam.add_load(load)
+    return beam
+
+
+def reactions(beam):
+    beam.calculate_reactions()
+    return (np.array([s.reaction_force for s in beam.supports]),
+            np.array([s.reaction_moment for s in beam.supports]))
+
+
+def assert_same_results(beam, expected, num_points=51):
+    forces, moments = reactions(beam)
+    expected_forces, expected_moments = reactions(expected)
+    np.testing.assert_allclose(forces, expected_forces, rtol=1e-9, atol=1e-6)
+    np.testing.assert_allclose(moments, expected_moments, rtol=1e-9, atol=1e-3)
+    for actual, wanted in zip(beam.get_samples(num_points), expected.get_samples(num_points)):
+        np.testing.assert_allclose(actual, wanted, rtol=1e-9, atol=1e-3)
+
+
+# Forces up, moments as clockwise couples on the beam, for P at A (B = L - A)
+# and for a full-length UDL of W
+CLOSED_FORMS = [
+    ('simply_supported', 'point', [P * B / L, P * A / L], [0, 0]),
+    ('simply_supported', 'udl', [W * L / 2, W * L / 2], [0, 0]),
+    ('cantilever', 'point', [P], [-P * A]),
+    ('cantilever', 'udl', [W * L], [-W * L ** 2 / 2]),
+    ('overhanging', 'point', [P * 2000.0 / 4000.0, P * 2000.0 / 4000.0], [0, 0]),
+    ('overhanging', 'udl', [W * L * 1000.0 / 4000.0, W * L * 3000.0 / 4000.0], [0, 0]),
+    ('fixed', 'point', [P * B ** 2 * (3 * A + B) / L ** 3, P * A ** 2 * (A + 3 * B) / L ** 3],
+     [-P * A * B ** 2 / L ** 2, P * A ** 2 * B / L ** 2]),
+    ('fixed', 'udl', [W * L / 2, W * L / 2], [-W * L ** 2 / 12, W * L ** 2 / 12]),
+    ('propped_cantilever', 'point', [P - P * A ** 2 * (3 * L - A) / (2 * L ** 3), P * A ** 2 * (3 * L - A) / (2 * L ** 3)],
+     [-P * A * B * (L + B) / (2 * L ** 2), 0]),
+    ('propped_cantilever', 'udl', [5 * W * L / 8, 3 * W * L / 8], [-W * L ** 2 / 8, 0]),
+    ('continuous', 'udl', [3 * W * L / 16, 5 * W * L / 8, 3 * W * L / 16], [0, 0, 0]),
+]
+
+
+@pytest.mark.parametrize('beam_type, kind, forces, moments', CLOSED_FORMS)
+def test_reactions_match_closed_forms(beam_type, kind, forces, moments):
+    load = PointLoad(P, A) if kind == 'point' else UniformDistributedLoad(W, 0, L)
+    actual_forces, actual_moments = reactions(make_beam(beam_type, [load]))
+    np.testing.assert_allclose(actual_forces, forces, rtol=1e-9)
+    np.testing.assert_allclose(actual_moments, moments, rtol=1e-9, atol=1e-6)
+
+
+def test_direct_mutation_invalidates_cache():
+    load = PointLoad(P, A)
+    beam = make_beam('fixed', [load, UniformDistributedLoad(W, 0, L)])
+    reactions(beam)
+    beam.get_samples(51)
+    load.magnitude = 2 * P
+    load.position = 1500.0
+    assert_same_results(beam, make_beam('fixed', [PointLoad(2 * P, 1500.0), UniformDistributedLoad(W, 0, L)]))
+
+
+def test_shared_load_updates_every_beam():
+    load = UniformDistributedLoad(W, 1000.0, 3000.0)
+    first = make_beam('simply_supported', [load])
+    second = make_beam('continuous', [load, PointLoad(P, A)])
+    reactions(first)
+    reactions(second)
+    first.get_samples(51)
+    load.end = 5000.0
+    assert_same_results(first, make_beam('simply_supported', [UniformDistributedLoad(W, 1000.0, 5000.0)]))
+    assert_same_results(second, make_beam('continuous', [UniformDistributedLoad(W, 1000.0, 5000.0), PointLoad(P, A)]))
+
+
+def varied_loads():
+    return [PointLoad(P, A), UniformDistributedLoad(W, 500.0, 4500.0),
+            UniformVaryingLoad(0.5, 3.0, 1000.0, 5000.0), MomentLoad(2e6, 3500.0)]
+
+
+@pytest.mark.parametrize('beam_type', list(SUPPORTS))
+def test_edits_match_fresh_analysis(beam_type):
+    loads = varied_loads()
+    beam = make_beam(beam_type, loads)
+    reactions(beam)
+    beam.get_samples(51)
+
+    beam.update_load(loads[0], magnitude=3 * P, position=5000.0)
+    assert_same_results(beam, make_beam(beam_type, [PointLoad(3 * P, 5000.0)] + varied_loads()[1:]))
+
+    beam.remove_load(loads[1])
+    assert_same_results(beam, make_beam(beam_type, [PointLoad(3 * P, 5000.0)] + varied_loads()[2:]))
+
+    extra = PointLoad(4000.0, 2500.0)
+    beam.add_load(extra)
+    beam.add_load(extra)
+    beam.update_load(extra, magnitude=500.0)
+    expected = [PointLoad(3 * P, 5000.0)] + varied_loads()[2:] + [PointLoad(500.0, 2500.0), PointLoad(500.0, 2500.0)]
+    assert_same_results(beam, make_beam(beam_type, expected))
+
+    beam.remove_load(extra)
+    assert_same_results(beam, make_beam(beam_type, expected[:-1]))
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORBIDDEN = ('matplotlib', 'scipy')
+
+_PROBE = """
+import sys
+import bendrix
+import bendrix.beam_analysis.beam, bendrix.beam_analysis.supports
+import bendrix.loads.loads, bendrix.utils.unit_conversion
+print(' '.join(sorted({m.split('.')[0] for m in sys.modules} & set(%r))))
+"""
+
+
+def test_core_import_skips_plotting_and_scipy():
+    # A fresh interpreter, since this test session may already hold either module
+    out = subprocess.run([sys.executable, '-c', _PROBE % (FORBIDDEN,)], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout.split()
+    assert out == [], f"import bendrix loaded {', '.join(out)}"
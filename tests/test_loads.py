@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from bendrix.loads.loads import LoadSet, PointLoad, UniformDistributedLoad, UniformVaryingLoad, MomentLoad
+from .test_beam import SUPPORTS, assert_same_results, make_beam
+
+POINTS = ([1000.0, -2500.0, 4000.0], [500.0, 2200.0, 5900.0])
+UDLS = ([1.5, 0.75], [0.0, 3000.0], [4000.0, 6000.0])
+UVLS = ([0.0, 2.0], [3.0, 0.5], [1000.0, 2000.0], [5000.0, 2500.0])
+MOMENTS = ([1e6, -4e5], [1500.0, 4500.0])
+
+
+def individual_loads():
+    return ([PointLoad(m, x) for m, x in zip(*POINTS)]
+            + [UniformDistributedLoad(w, a, b) for w, a, b in zip(*UDLS)]
+            + [UniformVaryingLoad(w1, w2, a, b) for w1, w2, a, b in zip(*UVLS)]
+            + [MomentLoad(m, x) for m, x in zip(*MOMENTS)])
+
+
+def load_set():
+    loads = LoadSet()
+    loads.add_point_loads(*POINTS)
+    loads.add_udls(*UDLS)
+    loads.add_uvls(*UVLS)
+    loads.add_moment_loads(*MOMENTS)
+    return loads
+
+
+@pytest.mark.parametrize('beam_type', list(SUPPORTS))
+def test_load_set_matches_individual_loads(beam_type):
+    assert_same_results(make_beam(beam_type, [load_set()]), make_beam(beam_type, individual_loads()))
+
+
+def test_load_set_totals_match_individual_loads():
+    loads, individual = load_set(), individual_loads()
+    assert loads.get_total_force() == pytest.approx(sum(l.get_total_force() for l in individual))
+    assert loads.get_moment_about(1234.0) == pytest.approx(sum(l.get_moment_about(1234.0) for l in individual))
+    x = np.linspace(0, 6000.0, 37)
+    np.testing.assert_allclose(loads.get_cumulative_force_up_to(x),
+                               sum(l.get_cumulative_force_up_to(x) for l in individual), atol=1e-6)
+
+
+def test_load_set_growth_invalidates_cache():
+    loads = load_set()
+    beam = make_beam('fixed', [loads])
+    beam.get_samples(51)
+    loads.add_point_loads([800.0], [3300.0])
+    assert_same_results(beam, make_beam('fixed', individual_loads() + [PointLoad(800.0, 3300.0)]))
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from bendrix.beam_analysis.reliability import BLOCK_SIZE, MonteCarlo, Normal, Uniform
+from bendrix.loads.loads import PointLoad, UniformDistributedLoad
+from .test_beam import make_beam
+
+# More than one block, so workers > 1 has blocks to spread
+SAMPLES = BLOCK_SIZE + 1000
+
+
+def simulate(beam_type, memory_mb, workers):
+    live = PointLoad(10000.0, 2000.0)
+    beam = make_beam(beam_type, [live, UniformDistributedLoad(2.0, 0, 6000.0)])
+    mc = MonteCarlo(beam).vary(live, magnitude=Normal(10000.0, 2000.0), position=Uniform(500.0, 5500.0))
+    return mc.run(SAMPLES, seed=7, num_points=21, memory_mb=memory_mb, workers=workers)
+
+
+COLUMNS = ('max_moment', 'min_moment', 'max_shear', 'min_shear', 'forces', 'moments')
+
+
+@pytest.mark.parametrize('beam_type', ['simply_supported', 'fixed'])
+def test_results_independent_of_workers(beam_type):
+    reference = simulate(beam_type, memory_mb=4, workers=1)
+    result = simulate(beam_type, memory_mb=4, workers=2)
+    assert len(result) == SAMPLES
+    for name in COLUMNS:
+        np.testing.assert_array_equal(getattr(result, name), getattr(reference, name))
+
+
+@pytest.mark.parametrize('beam_type', ['simply_supported', 'fixed'])
+def test_results_independent_of_memory(beam_type):
+    # Chunk sizes change BLAS summation order, so only round-off may differ
+    reference = simulate(beam_type, memory_mb=256, workers=1)
+    for memory_mb in (1, 4):
+        result = simulate(beam_type, memory_mb, workers=1)
+        for name in COLUMNS:
+            # Relative to the beam's peak, as min_moment is round-off around zero here
+            scale = (reference.peak_moment if 'moment' in name else reference.peak_shear).max()
+            np.testing.assert_allclose(getattr(result, name), getattr(reference, name), rtol=0, atol=1e-12 * scale)